@@ -0,0 +1,78 @@
+"""
+Benchmark of the volume calculation of `ComplexMesh`.
+
+Compares the facet-by-facet sum of determinants with the vectorized
+triple product of `gmsh_stl.facet_volume` on `tests/cone.stl` and on
+synthetic, tessellated spheres (see `synthetic.py`). Run via:
+
+    python benchmarks/bench_complex_volume.py [number of facets ...]
+"""
+import os
+import sys
+import time
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+from osp.wrappers.gmsh_wrapper.gmsh_stl import read_ascii_stl, facet_volume
+
+from synthetic import write_sphere
+
+path = os.path.dirname(os.path.abspath(__file__))
+CONE = os.path.join(path, os.pardir, "tests", "cone.stl")
+
+
+def legacy_volume(source_path, cutoff_level):
+    with open(source_path, "r") as source:
+        volume = 0
+        points = list()
+        for line in source:
+            line_split = line.split()
+            if "vertex" in line_split:
+                coords = list(map(float, line_split[-3:]))
+                if coords[-1] <= cutoff_level:
+                    points.append(coords)
+            elif "endloop" in line_split:
+                points = list()
+            if len(points) == 3:
+                volume += np.linalg.det(np.array(points))/6
+    return abs(volume)
+
+
+def vectorized_volume(source_path, cutoff_level):
+    return abs(facet_volume(read_ascii_stl(source_path), cutoff_level))
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def bench(name, source_path, n_facets, run_legacy=True):
+    for cutoff_level in [np.inf, 0.5]:
+        new, new_time = timed(vectorized_volume, source_path, cutoff_level)
+        if run_legacy:
+            old, old_time = timed(legacy_volume, source_path, cutoff_level)
+            speedup = f"{old_time/new_time:8.1f}x"
+            assert np.isclose(old, new), (old, new)
+        else:
+            old_time, speedup = np.nan, "       -"
+        print(
+            f"{name:>12} {n_facets:>9} {cutoff_level:>8} "
+            f"{old_time:10.4f} {new_time:10.4f} {speedup}"
+        )
+
+
+if __name__ == "__main__":
+    sizes = [int(float(n)) for n in sys.argv[1:]] or [10**4, 10**5, 10**6]
+    print(
+        f"{'geometry':>12} {'facets':>9} {'cutoff':>8} "
+        f"{'legacy [s]':>10} {'numpy [s]':>10} {'speedup':>9}"
+    )
+    bench("cone.stl", CONE, len(read_ascii_stl(CONE)))
+    with TemporaryDirectory() as temp_dir:
+        for size in sizes:
+            sphere = os.path.join(temp_dir, f"sphere_{size}.stl")
+            n_facets = write_sphere(sphere, size)
+            bench("sphere", sphere, n_facets, run_legacy=n_facets <= 2e5)
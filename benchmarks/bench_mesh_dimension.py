@@ -0,0 +1,33 @@
+"""
+Benchmark of surface-only (2D) versus volume (3D) meshing of
+`RectangularMesh` and `CylinderMesh` at the resolutions of the tests.
+Run via:
+
+    python benchmarks/bench_mesh_dimension.py
+"""
+from tempfile import TemporaryDirectory
+
+from osp.wrappers.gmsh_wrapper.gmsh_context import GMSHContext
+
+from helpers import meshes, timed
+
+
+if __name__ == "__main__":
+    print(f"{'geometry':>10} {'2D [s]':>8} {'3D [s]':>8} {'speedup':>8}")
+    with GMSHContext({"General.Terminal": 0}) as context, \
+            TemporaryDirectory() as temp_dir:
+        for name, factory in meshes().items():
+            results = dict()
+            for dimension in [2, 3]:
+                mesh = factory()
+                mesh.trait_set(
+                    context=context, mesh_dimension=dimension,
+                    export_geo=False
+                )
+                results[dimension] = timed(
+                    lambda: mesh.write_mesh(temp_dir)
+                )["min"]
+            print(
+                f"{name:>10} {results[2]:8.3f} {results[3]:8.3f} "
+                f"{results[3]/results[2]:7.1f}x"
+            )
@@ -0,0 +1,46 @@
+"""
+Benchmark of the emission of CUDS-results by `GMSHSession.run` for
+analytic dry-runs of rectangles, which is dominated by the creation of
+the result entities. Reports the time per run and the number of CUDS
+objects which each run adds to the registry of the session. Run via:
+
+    python benchmarks/bench_session_results.py [number of runs]
+"""
+import sys
+import time
+from tempfile import TemporaryDirectory
+
+from osp.core.namespaces import emmo, cuba
+from osp.wrappers.gmsh_wrapper.gmsh_session import GMSHSession
+from osp.wrappers.gmsh_wrapper.gmsh_cuds_translator import Rectangle
+
+
+def bench(runs):
+    times = list()
+    objects = list()
+    with TemporaryDirectory() as temp_dir, \
+            GMSHSession(dry_run=True) as session:
+        wrapper = cuba.Wrapper(session=session)
+        for _ in range(runs):
+            model = Rectangle(temp_dir, session=session).get_model()
+            wrapper.add(model, rel=emmo.hasPart)
+            before = len(session._registry)
+            start = time.perf_counter()
+            session.run()
+            times.append(time.perf_counter() - start)
+            objects.append(len(session._registry) - before)
+            wrapper.remove(model)
+    return times, objects
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    times, objects = bench(runs)
+    print(
+        f"{'runs':>6} {'mean [ms]':>10} {'min [ms]':>10} "
+        f"{'objects/run':>12}"
+    )
+    print(
+        f"{runs:>6} {1e3*sum(times)/runs:>10.3f} {1e3*min(times):>10.3f} "
+        f"{sum(objects)/runs:>12.1f}"
+    )
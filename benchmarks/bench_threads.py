@@ -0,0 +1,43 @@
+"""
+Scaling benchmark of multithreaded meshing of `RectangularMesh` and
+`CylinderMesh` at 1/2/4/8 threads, with the 3D-algorithm of the
+templates and with the parallel HXT-algorithm. Run via:
+
+    python benchmarks/bench_threads.py [resolution factor]
+
+whereas the resolutions of the tests are divided by the optional factor.
+"""
+import sys
+from tempfile import TemporaryDirectory
+
+from osp.wrappers.gmsh_wrapper.gmsh_context import GMSHContext
+
+from helpers import meshes, timed
+
+THREADS = [1, 2, 4, 8]
+
+
+if __name__ == "__main__":
+    factor = float(sys.argv[1]) if len(sys.argv) > 1 else 1
+    print(
+        f"{'geometry':>10} {'algorithm':>10} "
+        + " ".join(f"{n:>4} thr [s]" for n in THREADS)
+    )
+    with GMSHContext({"General.Terminal": 0}) as context, \
+            TemporaryDirectory() as temp_dir:
+        for name, factory in meshes(factor).items():
+            for algorithm in [None, "hxt"]:
+                times = list()
+                for num_threads in THREADS:
+                    mesh = factory()
+                    mesh.trait_set(
+                        context=context, export_geo=False,
+                        num_threads=num_threads, algorithm_3d=algorithm
+                    )
+                    times.append(timed(
+                        lambda: mesh.write_mesh(temp_dir)
+                    )["min"])
+                print(
+                    f"{name:>10} {algorithm or 'template':>10} "
+                    + " ".join(f"{t:>12.3f}" for t in times)
+                )
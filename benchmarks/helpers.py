@@ -0,0 +1,37 @@
+"""
+Helpers shared by the benchmarks: the rectangle and cylinder of the
+tests and the timing of repeated calls.
+"""
+import statistics
+import time
+
+
+def meshes(factor=1):
+    """
+    Returns factories of the rectangle and cylinder of the tests, whose
+    resolutions are divided by `factor`.
+    """
+    from osp.wrappers.gmsh_wrapper.gmsh_engine import (
+        RectangularMesh, CylinderMesh
+    )
+
+    return {
+        "rectangle": lambda: RectangularMesh(
+            x_length=0.02, y_length=0.01, z_length=0.15,
+            resolution=0.001/factor, units="m"
+        ),
+        "cylinder": lambda: CylinderMesh(
+            xy_radius=0.05, z_length=0.2,
+            resolution=0.0014/factor, units="m"
+        )
+    }
+
+
+def timed(function, repeat=3):
+    """Returns the minimum and median seconds of repeated calls"""
+    times = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times)}
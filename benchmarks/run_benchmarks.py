@@ -0,0 +1,255 @@
+"""
+Benchmark suite of the GMSH-wrapper with machine-readable results:
+
+- `complex`: extents, volume and cutoff-volume of `ComplexMesh` on
+  synthetic spheres and cones (see `synthetic.py`) with 1e3 up to 1e7
+  facets, ASCII- and binary-encoded, loaded at once or streamed.
+- `write_mesh`: `RectangularMesh.write_mesh` and `CylinderMesh.write_mesh`
+  across a ladder of resolutions.
+- `session`: end-to-end `GMSHSession.run` of a rectangle, as dry-run
+  and with meshing.
+
+Run via:
+
+    python benchmarks/run_benchmarks.py -o results.json
+    python benchmarks/run_benchmarks.py -o new.json --compare results.json
+
+Each result lists the `suite`, the `case` and its `parameters`, and the
+minimum and median `seconds` of the repetitions. Suites whose
+dependencies are not installed (e.g. gmsh or osp-core) are skipped with
+their error. With `--compare`, cases slower than the baseline by more
+than `--threshold` are reported, whereas the exit code is 1 then.
+"""
+import argparse
+from contextlib import contextmanager
+import json
+import os
+import platform
+import sys
+import time
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+from helpers import meshes, timed
+from synthetic import write_sphere, write_cone
+
+FACETS = [10**3, 10**4, 10**5, 10**6, 10**7]
+RESOLUTIONS = [1, 2, 4]
+GENERATORS = {
+    "sphere": write_sphere,
+    "cone": write_cone
+}
+
+
+def result(suite, case, seconds, **parameters):
+    return {
+        "suite": suite,
+        "case": case,
+        "parameters": parameters,
+        "seconds": seconds
+    }
+
+
+def bench_complex(max_facets, repeat):
+    from osp.wrappers.gmsh_wrapper.gmsh_engine import ComplexMesh
+    from osp.wrappers.gmsh_wrapper.gmsh_stl import GEOMETRY_CACHE
+
+    results = list()
+    with TemporaryDirectory() as temp_dir:
+        for n_facets in [n for n in FACETS if n <= max_facets]:
+            for shape, generator in GENERATORS.items():
+                for encoding in ["ascii", "binary"]:
+                    source_path = os.path.join(
+                        temp_dir, f"{shape}_{n_facets}_{encoding}.stl"
+                    )
+                    facets = generator(source_path, n_facets, encoding)
+                    parameters = {
+                        "shape": shape,
+                        "facets": facets,
+                        "encoding": encoding,
+                        "bytes": os.path.getsize(source_path)
+                    }
+                    for streaming in [False, True]:
+                        def mesh():
+                            GEOMETRY_CACHE.clear()
+                            return ComplexMesh(
+                                source_path=source_path, units="m",
+                                streaming=streaming
+                            )
+                        cases = {
+                            "inspect_file": lambda: mesh().inspect_file(),
+                            "volume": lambda: mesh().volume,
+                            "cutoff_volume": lambda: mesh().cutoff_volume(
+                                0.5
+                            )
+                        }
+                        for case, function in cases.items():
+                            results.append(result(
+                                "complex", case, timed(function, repeat),
+                                streaming=streaming, **parameters
+                            ))
+                    os.remove(source_path)
+    return results
+
+
+def bench_write_mesh(max_facets, repeat):
+    from osp.wrappers.gmsh_wrapper.gmsh_context import GMSHContext
+
+    results = list()
+    with GMSHContext({"General.Terminal": 0}) as context, \
+            TemporaryDirectory() as temp_dir:
+        for factor in RESOLUTIONS:
+            for name, factory in meshes(factor).items():
+                mesh = factory()
+                mesh.context = context
+                seconds = timed(lambda: mesh.write_mesh(temp_dir), repeat)
+                results.append(result(
+                    "write_mesh", name, seconds,
+                    resolution=mesh.resolution,
+                    nodes=mesh.mesh_statistics.get("nodes"),
+                    elements=sum(
+                        mesh.mesh_statistics.get("elements", {}).values()
+                    )
+                ))
+    return results
+
+
+def bench_session(max_facets, repeat):
+    from osp.core.namespaces import emmo, cuba
+    from osp.wrappers.gmsh_wrapper.gmsh_session import GMSHSession
+    from osp.wrappers.gmsh_wrapper.gmsh_cuds_translator import Rectangle
+
+    results = list()
+    for dry_run in [True, False]:
+        with TemporaryDirectory() as temp_dir, \
+                GMSHSession(dry_run=dry_run) as session:
+            wrapper = cuba.Wrapper(session=session)
+
+            def run():
+                model = Rectangle(
+                    temp_dir,
+                    values={
+                        "x": 20, "y": 10, "z": 150,
+                        "filling_fraction": 0.5, "resolution": 1
+                    },
+                    units={"lengths": "mm", "resolution": "mm"},
+                    session=session
+                ).get_model()
+                wrapper.add(model, rel=emmo.hasPart)
+                session.run()
+                wrapper.remove(model)
+
+            results.append(result(
+                "session", "run", timed(run, repeat), dry_run=dry_run
+            ))
+    return results
+
+
+SUITES = {
+    "complex": bench_complex,
+    "write_mesh": bench_write_mesh,
+    "session": bench_session
+}
+
+
+def compare(results, baseline, threshold):
+    """Returns the cases which are slower than in the baseline"""
+    def key(entry):
+        return json.dumps(
+            [entry["suite"], entry["case"], entry["parameters"]],
+            sort_keys=True
+        )
+
+    reference = {key(entry): entry for entry in baseline["results"]}
+    regressions = list()
+    for entry in results["results"]:
+        if key(entry) in reference:
+            ratio = (
+                entry["seconds"]["min"]
+                / reference[key(entry)]["seconds"]["min"]
+            )
+            if ratio > 1 + threshold:
+                regressions.append((entry, ratio))
+    return regressions
+
+
+@contextmanager
+def output(target_file):
+    if target_file:
+        with open(target_file, "w") as file:
+            yield file
+    else:
+        yield sys.stdout
+
+
+def metadata():
+    try:
+        import gmsh
+        gmsh_version = gmsh.__version__
+    except ImportError:
+        gmsh_version = None
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "gmsh": gmsh_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark suite of the GMSH-wrapper"
+    )
+    parser.add_argument(
+        "suites", nargs="*",
+        help=f"suites to run out of {', '.join(SUITES)} (default: all)"
+    )
+    parser.add_argument(
+        "--max-facets", type=float, default=1e6,
+        help="largest synthetic .stl-file of the `complex` suite"
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument(
+        "-o", "--output", default=None,
+        help=".json-file for the results (default: stdout)"
+    )
+    parser.add_argument(
+        "--compare", default=None, help=".json-file of a baseline run"
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="relative slowdown reported as regression (default: 0.2)"
+    )
+    args = parser.parse_args(argv)
+    for suite in args.suites:
+        if suite not in SUITES:
+            parser.error(f"unknown suite {suite}")
+
+    results = {"metadata": metadata(), "results": [], "skipped": {}}
+    for suite in args.suites or list(SUITES):
+        print(f"running {suite}", file=sys.stderr)
+        try:
+            results["results"] += SUITES[suite](args.max_facets, args.repeat)
+        except ImportError as error:
+            results["skipped"][suite] = str(error)
+    with output(args.output) as file:
+        json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for entry, ratio in regressions:
+            print(
+                f"{entry['suite']}/{entry['case']} {entry['parameters']}: "
+                f"{ratio:.2f}x slower",
+                file=sys.stderr
+            )
+        return int(bool(regressions))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
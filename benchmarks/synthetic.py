@@ -0,0 +1,102 @@
+"""
+Generators of synthetic, tessellated spheres and cones as ASCII- or
+binary-encoded .stl-files of a given number of facets (e.g. 1e3 to 1e7).
+The facets are written in blocks of one ring of the surface of
+revolution, so that even large files do not need to fit into memory.
+"""
+import numpy as np
+
+from osp.wrappers.gmsh_wrapper.gmsh_stl import STL_DTYPE
+
+ASCII_FACET = (
+    " facet normal 0 0 0\n  outer loop\n"
+    + "   vertex %.9g %.9g %.9g\n" * 3
+    + "  endloop\n endfacet"
+)
+
+
+def sphere_profile(n_facets, radius=1.0):
+    """
+    Profile (r, z) from the bottom to the top and number of segments
+    around the z-axis of a sphere with about `n_facets` facets
+    """
+    n_theta = max(2, int(round(np.sqrt(n_facets / 4))))
+    theta = np.linspace(np.pi, 0, n_theta + 1)
+    return radius*np.stack([np.sin(theta), np.cos(theta)], axis=-1), \
+        2*n_theta
+
+
+def cone_profile(n_facets, radius=1.0, height=1.0):
+    """
+    Profile (r, z) from the bottom to the top and number of segments
+    around the z-axis of a closed cone with about `n_facets` facets
+    """
+    n_steps = max(1, int(round(np.sqrt(n_facets / 8))))
+    steps = np.linspace(0, 1, n_steps + 1)
+    base = np.stack([radius*steps, np.zeros_like(steps)], axis=-1)
+    side = np.stack([radius*(1 - steps), height*steps], axis=-1)
+    return np.concatenate([base, side[1:]]), 2*n_steps
+
+
+def revolve(profile, segments):
+    """
+    Yields the facets of the surface of revolution of a `profile` of
+    (r, z)-points around the z-axis, one block per profile segment.
+    Facets at the axis are degenerated, which does not change the
+    volume of the body.
+    """
+    phi = np.linspace(0, 2*np.pi, segments + 1)
+    rings = np.stack([
+        profile[:, :1]*np.cos(phi),
+        profile[:, :1]*np.sin(phi),
+        np.repeat(profile[:, 1:], len(phi), axis=1)
+    ], axis=-1)
+    for lower, upper in zip(rings[:-1], rings[1:]):
+        a, b = lower[:-1], lower[1:]
+        c, d = upper[1:], upper[:-1]
+        yield np.concatenate([
+            np.stack([a, b, c], axis=1),
+            np.stack([a, c, d], axis=1)
+        ])
+
+
+def write_stl(target_path, profile, segments, encoding="ascii"):
+    """
+    Writes the surface of revolution into an .stl-file.
+
+    Returns
+    -------
+    int
+        number of written facets.
+    """
+    n_facets = 2*segments*(len(profile) - 1)
+    if encoding == "binary":
+        with open(target_path, "wb") as file:
+            file.write(b"synthetic".ljust(80, b"\0"))
+            file.write(np.uint32(n_facets).tobytes())
+            for facets in revolve(profile, segments):
+                records = np.zeros(len(facets), dtype=STL_DTYPE)
+                records["vertices"] = facets
+                records.tofile(file)
+    else:
+        with open(target_path, "w") as file:
+            file.write("solid synthetic\n")
+            for facets in revolve(profile, segments):
+                np.savetxt(file, facets.reshape(-1, 9), fmt=ASCII_FACET)
+            file.write("endsolid synthetic\n")
+    return n_facets
+
+
+def write_sphere(target_path, n_facets, encoding="ascii", radius=1.0):
+    """Writes a sphere with about `n_facets` facets"""
+    return write_stl(
+        target_path, *sphere_profile(n_facets, radius), encoding
+    )
+
+
+def write_cone(target_path, n_facets, encoding="ascii", radius=1.0,
+               height=1.0):
+    """Writes a cone with about `n_facets` facets"""
+    return write_stl(
+        target_path, *cone_profile(n_facets, radius, height), encoding
+    )
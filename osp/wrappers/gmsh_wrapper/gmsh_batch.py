@@ -0,0 +1,201 @@
+"""
+Batch meshing of many rectangles and cylinders in a pool of worker
+processes, each of them with its own persistent gmsh-kernel.
+
+A mesh specification is a dictionary with the `geometry` ('rectangle'
+or 'cylinder'), the `target_path` of the output and the traits of the
+correlating mesh, e.g.:
+
+    {
+        'geometry': 'rectangle',
+        'target_path': 'path/to/my/output/directory',
+        'x_length': 0.02,
+        'y_length': 0.01,
+        'z_length': 0.15,
+        'resolution': 0.001,
+        'units': 'm'
+    }
+
+Run from the command line via:
+
+    python -m osp.wrappers.gmsh_wrapper.gmsh_batch specs.json -p 4
+
+whereas the specifications are given as .json-list or as .csv-table
+with one column per key.
+"""
+import argparse
+import csv
+import json
+from multiprocessing import Pool
+import os
+import sys
+import traceback
+
+from osp.wrappers.gmsh_wrapper.gmsh_engine import (
+    RectangularMesh, CylinderMesh
+)
+from osp.wrappers.gmsh_wrapper.gmsh_context import GMSHContext
+
+
+MESHES = {
+    'rectangle': RectangularMesh,
+    'cylinder': CylinderMesh
+}
+
+# persistent gmsh-kernel of a worker process
+_CONTEXT = None
+
+
+def run_batch(specs, processes=None, progress=None):
+    """
+    Meshes all specifications in a pool of worker processes.
+
+    Parameters
+    ----------
+    specs : list of dict
+        mesh specifications as described in the module docstring.
+    processes : int
+        number of worker processes, defaults to the number of CPUs.
+    progress : callable
+        called as `progress(done, total, result)` after each job.
+
+    Returns
+    -------
+    list of dict
+        one result per specification in the same order, with the
+        `volume`, `max_extent`, `filling_extent`, `inside_location`
+        and `output_files` of the mesh, or the traceback as `error`
+        (otherwise None) if the job failed.
+    """
+    specs = list(specs)
+    results = [None] * len(specs)
+    with Pool(processes, initializer=init_worker) as pool:
+        jobs = pool.imap_unordered(run_job, enumerate(specs))
+        for done, result in enumerate(jobs, start=1):
+            results[result['index']] = result
+            if progress:
+                progress(done, len(specs), result)
+    return results
+
+
+def run_job(job, context=None):
+    """Meshes one indexed specification `job = (index, spec)`"""
+    index, spec = job
+    result = {'index': index, 'error': None}
+    try:
+        spec = dict(spec)
+        geometry = spec.pop('geometry')
+        target_path = spec.pop('target_path')
+        if geometry not in MESHES:
+            raise ValueError(f'Geometry {geometry} not supported')
+        # the jobs are already parallelized over the processes
+        spec.setdefault('num_threads', 1)
+        os.makedirs(target_path, exist_ok=True)
+        mesh = MESHES[geometry](**spec, context=context or _CONTEXT)
+        mesh.write_mesh(target_path)
+        result.update(
+            volume=mesh.volume,
+            max_extent=dict(mesh.max_extent),
+            filling_extent=dict(mesh.filling_extent),
+            inside_location=list(mesh.inside_location),
+            output_files=list(mesh.output_files)
+        )
+    except Exception:
+        result['error'] = traceback.format_exc()
+    return result
+
+
+def run_mesh(job):
+    """
+    Writes the mesh of `job = (mesh, target_path)` in a worker process,
+    or only inspects it if the target path is None.
+    """
+    mesh, target_path = job
+    # the meshes are already parallelized over the processes
+    mesh.trait_set(context=_worker_context(), num_threads=1)
+    if target_path:
+        mesh.write_mesh(target_path)
+    else:
+        mesh.inspect_file()
+    # the persistent gmsh-kernel stays in the worker process
+    mesh.context = None
+    return mesh
+
+
+def init_worker():
+    """Initializes the persistent gmsh-kernel of a worker process"""
+    global _CONTEXT
+    _CONTEXT = GMSHContext({'General.Terminal': 0})
+    _CONTEXT.initialize()
+
+
+def _worker_context():
+    """
+    Returns the persistent gmsh-kernel of a worker process, which is
+    initialized with its first job (`ProcessPoolExecutor` only takes an
+    initializer as of Python 3.7).
+    """
+    if _CONTEXT is None:
+        init_worker()
+    return _CONTEXT
+
+
+def read_specs(spec_file):
+    """Reads mesh specifications from a .json- or .csv-file"""
+    if spec_file.endswith('.csv'):
+        with open(spec_file, newline='') as file:
+            return [
+                {
+                    key: _parse_value(value)
+                    for key, value in row.items() if value != ''
+                }
+                for row in csv.DictReader(file)
+            ]
+    with open(spec_file) as file:
+        return json.load(file)
+
+
+def _parse_value(value):
+    for parse in [int, float]:
+        try:
+            return parse(value)
+        except ValueError:
+            pass
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Mesh many rectangles and cylinders with GMSH'
+    )
+    parser.add_argument('specs', help='.json- or .csv-file of mesh specs')
+    parser.add_argument(
+        '-p', '--processes', type=int, default=None,
+        help='number of worker processes (default: number of CPUs)'
+    )
+    parser.add_argument(
+        '-o', '--output', default=None,
+        help='.json-file for the results (default: stdout)'
+    )
+    args = parser.parse_args(argv)
+
+    def progress(done, total, result):
+        status = 'failed' if result['error'] else 'done'
+        print(
+            f'[{done}/{total}] job {result["index"]} {status}',
+            file=sys.stderr
+        )
+
+    results = run_batch(
+        read_specs(args.specs), processes=args.processes, progress=progress
+    )
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+    return int(any(result['error'] for result in results))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
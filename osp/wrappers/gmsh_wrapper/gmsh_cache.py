@@ -0,0 +1,136 @@
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # e.g. on Windows
+    fcntl = None
+
+
+class MeshCache:
+
+    """
+    Content-addressed on-disk cache of generated mesh files. Each entry
+    is a directory named after the hash of the inputs of the mesh (see
+    `BaseMesh._fingerprint`), which holds copies of its output files.
+
+    Entries are published atomically by renaming a completed temporary
+    directory, so that several worker processes may share one cache.
+    If the total size of the entries exceeds `max_bytes`, the least
+    recently used ones are evicted under an exclusive file lock.
+
+    Parameters
+    ----------
+    directory : str
+        root directory of the cache, which is created if needed.
+    max_bytes : int
+        maximum total size of all cached files.
+    link : bool
+        whether cached files are materialized as hardlinks (falling back
+        to copies, e.g. across filesystems) or always copied. Hardlinked
+        files must not be modified in-place.
+    """
+
+    def __init__(self, directory, max_bytes=2**30, link=True):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.link = link
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(inputs):
+        """Hashes a json-serializable description of the mesh inputs"""
+        text = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def materialize(self, key, target_path):
+        """
+        Places the cached files of `key` into `target_path`.
+
+        Returns
+        -------
+        list of str
+            paths of the materialized files or None if not cached.
+        """
+        entry = os.path.join(self.directory, key)
+        try:
+            names = sorted(os.listdir(entry))
+            os.utime(entry)
+            target_files = [
+                self._place(os.path.join(entry, name), target_path)
+                for name in names
+            ]
+        except OSError:
+            # not cached or evicted in the meantime
+            self.misses += 1
+            return None
+        self.hits += 1
+        return target_files
+
+    def store(self, key, files):
+        """Adds copies of the `files` to the cache under `key`"""
+        entry = os.path.join(self.directory, key)
+        if os.path.isdir(entry):
+            return
+        temp_dir = tempfile.mkdtemp(prefix='.tmp-', dir=self.directory)
+        for file in files:
+            shutil.copy2(file, temp_dir)
+        try:
+            os.rename(temp_dir, entry)
+        except OSError:
+            # another process has published the entry first
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        self.evict()
+
+    def evict(self):
+        """Removes least recently used entries beyond `max_bytes`"""
+        with self._lock():
+            entries = list()
+            for key in os.listdir(self.directory):
+                entry = os.path.join(self.directory, key)
+                if key.startswith('.') or not os.path.isdir(entry):
+                    continue
+                size = sum(
+                    os.path.getsize(os.path.join(entry, name))
+                    for name in os.listdir(entry)
+                )
+                entries.append((os.path.getmtime(entry), size, entry))
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+
+    def _place(self, source, target_path):
+        target = os.path.join(target_path, os.path.basename(source))
+        if os.path.exists(target) and os.path.samefile(source, target):
+            return target
+        temp_target = f'{target}.{os.getpid()}.tmp'
+        if self.link:
+            try:
+                os.link(source, temp_target)
+            except OSError:
+                shutil.copy2(source, temp_target)
+        else:
+            shutil.copy2(source, temp_target)
+        os.replace(temp_target, target)
+        return target
+
+    @contextmanager
+    def _lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, '.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
@@ -0,0 +1,129 @@
+from contextlib import contextmanager
+import importlib
+
+from osp.wrappers.gmsh_wrapper.gmsh_tracing import span
+
+
+# options which are modified by the .geo-templates and therefore
+# need to be restored after each job
+TEMPLATE_OPTIONS = ["Mesh.Algorithm3D"]
+
+
+class LazyModule:
+
+    """
+    Imports a module only on first attribute access, so that the shared
+    library of gmsh is not loaded (e.g. for analytic dry-runs) unless
+    a mesh is actually generated or read.
+
+    Parameters
+    ----------
+    name : str
+        name of the module to be imported.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+
+gmsh = LazyModule('gmsh')
+
+
+class GMSHContext:
+
+    """
+    Keeps the gmsh-kernel initialized over several meshing jobs, instead
+    of initializing and finalizing it for each of them. After each job,
+    the model is cleared and all options which have been changed during
+    the job are restored, so that no state leaks into the next one.
+
+    Since gmsh has a global state, only one context should be
+    initialized per process.
+
+    Parameters
+    ----------
+    options : dict
+        gmsh-options (e.g. {'General.Terminal': 0}) which are
+        applied once for all jobs after the initialization.
+    """
+
+    def __init__(self, options=None):
+        self.options = dict(options or {})
+        self._defaults = dict()
+        self._initialized = False
+
+    def __enter__(self):
+        self.initialize()
+        return self
+
+    def __exit__(self, *args):
+        self.finalize()
+
+    @property
+    def initialized(self):
+        return self._initialized
+
+    def initialize(self):
+        if not self._initialized:
+            with span('gmsh_initialize'):
+                gmsh.initialize()
+            self._initialized = True
+            for name, value in self.options.items():
+                _set_option(name, value)
+            self._defaults = {
+                name: gmsh.option.getNumber(name)
+                for name in TEMPLATE_OPTIONS
+            }
+
+    def finalize(self):
+        if self._initialized:
+            gmsh.finalize()
+            self._initialized = False
+
+    def set_option(self, name, value):
+        """Sets a gmsh-option for the current job only"""
+        if name not in self._defaults:
+            self._defaults[name] = _get_option(name, value)
+        _set_option(name, value)
+
+    def reset(self):
+        """Clears the model and restores the options of the last job"""
+        gmsh.clear()
+        for name, value in self._defaults.items():
+            _set_option(name, value)
+        self._defaults = {
+            name: value for name, value in self._defaults.items()
+            if name in TEMPLATE_OPTIONS
+        }
+
+    @contextmanager
+    def job(self):
+        """Initializes the kernel if needed and resets it after the job"""
+        self.initialize()
+        try:
+            yield self
+        finally:
+            self.reset()
+
+
+def _get_option(name, value):
+    if isinstance(value, str):
+        return gmsh.option.getString(name)
+    return gmsh.option.getNumber(name)
+
+
+def _set_option(name, value):
+    if isinstance(value, str):
+        gmsh.option.setString(name, value)
+    else:
+        gmsh.option.setNumber(name, value)
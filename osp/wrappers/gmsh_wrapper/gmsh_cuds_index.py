@@ -0,0 +1,83 @@
+from collections import defaultdict
+from functools import lru_cache
+
+
+class CudsIndex:
+
+    """
+    Index of the subgraph of CUDS-objects which is reachable from a root
+    (e.g. a `MeshGeneration`) by active relationships. The subgraph is
+    walked only once, so that parsing the input of a computation does
+    not query the same objects again and again, e.g. along sequences
+    of `hasSpatialNext`.
+
+    The index is a snapshot and must be rebuilt if the subgraph changes.
+
+    Parameters
+    ----------
+    root : Cuds
+        root object of the subgraph.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        # uid -> list of (neighbour, relationship)
+        self._neighbours = dict()
+        # oclass -> list of entities
+        self._entities = defaultdict(list)
+        stack = [root]
+        while stack:
+            entity = stack.pop()
+            if entity.uid in self._neighbours:
+                continue
+            self._neighbours[entity.uid] = entity.get(return_rel=True)
+            self._entities[entity.oclass].append(entity)
+            stack.extend(
+                neighbour for neighbour, _ in self._neighbours[entity.uid]
+                if neighbour.uid not in self._neighbours
+            )
+
+    def __contains__(self, entity):
+        return entity.uid in self._neighbours
+
+    def __len__(self):
+        return len(self._neighbours)
+
+    def __iter__(self):
+        for entities in self._entities.values():
+            yield from entities
+
+    def relationships(self, entity):
+        """Returns all pairs of neighbour and relationship of an entity"""
+        return list(self._neighbours[entity.uid])
+
+    def get(self, entity, rel=None, oclass=None):
+        """
+        Returns the neighbours of an entity like `Cuds.get`, optionally
+        filtered by (sub-)relationship and (sub-)class.
+        """
+        if entity.uid not in self._neighbours:
+            kwargs = {'rel': rel, 'oclass': oclass}
+            return entity.get(**{
+                key: value for key, value in kwargs.items() if value
+            })
+        return [
+            neighbour
+            for neighbour, relationship in self._neighbours[entity.uid]
+            if (rel is None or _is_subclass(relationship, rel))
+            and (oclass is None or _is_subclass(neighbour.oclass, oclass))
+        ]
+
+    def entities(self, oclass):
+        """Returns all entities of the subgraph which are an `oclass`"""
+        return [
+            entity
+            for entity_class, entities in self._entities.items()
+            if _is_subclass(entity_class, oclass)
+            for entity in entities
+        ]
+
+
+@lru_cache(maxsize=None)
+def _is_subclass(entity_class, superclass):
+    return entity_class.is_subclass_of(superclass)
@@ -1,9 +1,44 @@
 from osp.wrappers.cuds_translator import CudsTranslator
 from osp.core.namespaces import emmo
+from osp.wrappers.gmsh_wrapper.gmsh_cuds_index import CudsIndex
 import emmo_cfd
 import os
 
 
+# parsed templates of the translators per process
+_TEMPLATES = dict()
+
+
+def stamp(index, session=None):
+    """
+    Copies an indexed subgraph of CUDS-objects with new UUIDs.
+
+    Parameters
+    ----------
+    index : CudsIndex
+        index of the subgraph, e.g. of the model of a parsed template.
+    session : Session
+        session of the copies, by default the core session.
+
+    Returns
+    -------
+    dict
+        copies of all objects of the subgraph by the UUID of the original.
+    """
+    kwargs = {'session': session} if session else {}
+    copies = dict()
+    for entity in index:
+        attributes = {
+            attribute.argname: value
+            for attribute, value in entity.get_attributes().items()
+        }
+        copies[entity.uid] = entity.oclass(**kwargs, **attributes)
+    for entity in index:
+        for neighbour, rel in index.relationships(entity):
+            copies[entity.uid].add(copies[neighbour.uid], rel=rel)
+    return copies
+
+
 class BaseTranslator(CudsTranslator):
 
     gmsh_model = emmo_cfd.get_file("gmsh_model", ".sparql")
@@ -11,12 +46,19 @@ class BaseTranslator(CudsTranslator):
     filling_fraction = emmo_cfd.get_file("filling_fraction", ".sparql")
     geo_data = emmo_cfd.get_file("geo_data", ".sparql")
 
-    def __init__(self, rdf_file, directory=None, session=None):
-        self.imports = super().__init__(rdf_file, session=session, fmt="ttl")
+    def __init__(self, rdf_file, directory=None, session=None,
+                 encoding="ascii", formats=("stl",)):
+        template = self._get_template(rdf_file)
+        self.imports = template.imports
+        self._template = template
+        self._copies = stamp(template._index, session=session)
         if directory:
-            self.set_directory(directory)
+            self.set_directory(
+                directory, encoding=encoding, formats=formats
+            )
 
-    def set_directory(self, directory, file_name="new_surface"):
+    def set_directory(self, directory, file_name="new_surface",
+                      encoding="ascii", formats=("stl",)):
         dir_seq = emmo.DirectorySequence()
         dir_split = os.path.split(directory)
         previous_dir = list()
@@ -37,10 +79,88 @@ class BaseTranslator(CudsTranslator):
                 )
             previous_dir.append(directory)
             dir_seq.add(directory, rel=relation)
-        stl = emmo.STL()
+        if encoding not in ["ascii", "binary"]:
+            raise ValueError('File encoding must be `ascii` or `binary`')
+        file_formats = list()
+        for file_format in formats:
+            if file_format not in ["stl", "msh", "vtk"]:
+                raise ValueError('File format must be `stl`, `msh` or `vtk`')
+            file_format = getattr(emmo, file_format.upper())()
+            if file_format.is_a(emmo.STL) and encoding == "binary":
+                file_format.add(
+                    emmo.String(hasSymbolData=encoding), rel=emmo.hasSign
+                )
+            file_formats.append(file_format)
         name = emmo.String(hasSymbolData=file_name)
         self.geo_file = emmo.File()
-        self.geo_file.add(stl, name, dir_seq, rel=emmo.hasSign)
+        self.geo_file.add(*file_formats, name, dir_seq, rel=emmo.hasSign)
+
+    @classmethod
+    def _get_template(cls, rdf_file):
+        """
+        Parses the template of the model only once per process, whereas
+        each translator works on its own copy of the parsed model.
+        """
+        key = (cls, rdf_file)
+        if key not in _TEMPLATES:
+            template = cls.__new__(cls)
+            template._query_results = dict()
+            template.imports = CudsTranslator.__init__(
+                template, rdf_file, fmt="ttl"
+            )
+            template._index = CudsIndex(
+                template._query(template.gmsh_model)[0][0]
+            )
+            _TEMPLATES[key] = template
+        return _TEMPLATES[key]
+
+    def _query(self, query):
+        """Runs a query on the template only once per process"""
+        if query not in self._query_results:
+            self._query_results[query] = super().get_cuds(query)
+        return self._query_results[query]
+
+    @classmethod
+    def from_table(cls, rows, session=None):
+        """
+        Builds one model per row of a table, e.g. of the `directory`,
+        `values` and `units` of a `Rectangle`, from the same template.
+
+        Parameters
+        ----------
+        rows : list of dict
+            keyword arguments of the constructor per model.
+        session : Session
+            session of all models.
+
+        Returns
+        -------
+        list of BaseTranslator
+            one translator per row.
+        """
+        return [cls(**row, session=session) for row in rows]
+
+    def get_cuds(self, query):
+        """
+        Returns the result of a query on the parsed template, which is
+        run only once per class, mapped onto the copy of the model of
+        this translator. Since the template is never modified, its
+        results stay valid for all translators.
+        """
+        return [
+            tuple(self._get_copy(entity) for entity in row)
+            for row in self._template._query(query)
+        ]
+
+    def _get_copy(self, entity):
+        """Returns the copy of an entity of the template"""
+        if entity.uid not in self._copies:
+            raise ValueError(
+                f'{entity.oclass} {entity.uid} is not part of the model '
+                f'of {type(self).__name__}, so that it can not be mapped '
+                'onto its copy'
+            )
+        return self._copies[entity.uid]
 
     def set_resolution(self, values, units):
         self.edit_quantity(
@@ -91,8 +211,12 @@ class Rectangle(BaseTranslator):
     values = {'x': 1, 'y': 1, 'z': 1, 'filling_fraction': 1, 'resolution': 1}
     units = {'lengths': 'm', 'resolution': 'cm'}
 
-    def __init__(self, directory, values=values, units=units, session=None):
-        super().__init__(self.rdf_file, session=session, directory=directory)
+    def __init__(self, directory, values=values, units=units, session=None,
+                 encoding="ascii", formats=("stl",)):
+        super().__init__(
+            self.rdf_file, session=session, directory=directory,
+            encoding=encoding, formats=formats
+        )
         self.set_lengths(values, units)
         self.set_resolution(values, units)
         self.set_filling_fraction(values)
@@ -113,8 +237,12 @@ class Cylinder(BaseTranslator):
     values = {'radius': 1, 'length': 1, 'filling_fraction': 1, 'resolution': 1}
     units = {'lengths': 'm', 'resolution': 'cm'}
 
-    def __init__(self, directory, values=values, units=units, session=None):
-        super().__init__(self.rdf_file, session=session, directory=directory)
+    def __init__(self, directory, values=values, units=units, session=None,
+                 encoding="ascii", formats=("stl",)):
+        super().__init__(
+            self.rdf_file, session=session, directory=directory,
+            encoding=encoding, formats=formats
+        )
         self.set_lengths(values, units)
         self.set_resolution(values, units)
         self.set_filling_fraction(values)
@@ -148,7 +276,9 @@ class Complex(BaseTranslator):
         geo_data = self.get_cuds(self.geo_data)[0][0]
         directory, file_name = os.path.split(input_file)
         name, extension = os.path.splitext(file_name)
-        self.set_directory(directory, file_name=name)
+        self.set_directory(
+            directory, file_name=name, formats=[extension[1:].lower()]
+        )
         geo_data.add(self.geo_file, rel=emmo.hasSign)
 
     def set_inside_point(self, values, units):
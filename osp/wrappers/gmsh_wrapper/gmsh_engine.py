@@ -1,14 +1,22 @@
 from abc import abstractmethod
+from contextlib import contextmanager
+from functools import lru_cache
+import inspect
 import os
 import numpy as np
-from numpy import linalg
-import gmsh
 
 from traits.api import (
-    ABCHasStrictTraits, Enum, Property,
+    ABCHasStrictTraits, Any, Enum, Property, Instance, Bool, Int,
     Float, File, List, Dict, Tuple
 )
 
+from osp.wrappers.gmsh_wrapper.gmsh_cache import MeshCache
+from osp.wrappers.gmsh_wrapper.gmsh_context import GMSHContext, gmsh
+from osp.wrappers.gmsh_wrapper.gmsh_tracing import span
+from osp.wrappers.gmsh_wrapper.gmsh_stl import (
+    load_stl, iter_stl, facet_statistics, VolumeProfile, GEOMETRY_CACHE
+)
+
 
 SUPPORTED_UNITS = ['mm', 'cm', 'm']
 CONVERSIONS = {
@@ -22,6 +30,34 @@ CONVERSIONS = {
     'cm^3': 0.01**3,
     'm^3': 1,
 }
+# mesh file formats which can be written and read, whereas .msh is
+# binary-encoded (gmsh can not read binary-encoded .vtk-files back)
+MESH_FORMATS = ['stl', 'msh', 'vtk']
+# number of corners of the linear triangles and tetrahedra of gmsh
+SIMPLICES = {2: 3, 4: 4}
+# adjacent corners of each corner of the linear quadrangles, hexahedra
+# and prisms of gmsh (in right-handed order) and the scaled Jacobian
+# of the corners of the ideal element
+CORNERS = {
+    3: ([[1, 3], [2, 0], [3, 1], [0, 2]], 1),
+    5: (
+        [[1, 3, 4], [2, 0, 5], [3, 1, 6], [0, 2, 7],
+         [7, 5, 0], [4, 6, 1], [5, 7, 2], [6, 4, 3]],
+        1
+    ),
+    6: (
+        [[1, 2, 3], [2, 0, 4], [0, 1, 5], [5, 4, 0], [3, 5, 1], [4, 3, 2]],
+        np.sqrt(3)/2
+    )
+}
+# 3D-meshing algorithms of gmsh, whereas only HXT is parallelized
+ALGORITHMS_3D = {
+    'delaunay': 1,
+    'frontal': 4,
+    'mmg3d': 7,
+    'rtree': 9,
+    'hxt': 10
+}
 
 
 def extent(min_extent=[0, 0, 0], max_extent=[0, 0, 0]):
@@ -35,6 +71,153 @@ def extent(min_extent=[0, 0, 0], max_extent=[0, 0, 0]):
     }
 
 
+def mesh_statistics(dimension):
+    """
+    Collects the statistics of the current gmsh-model from the bulk
+    accessors of gmsh.
+
+    Parameters
+    ----------
+    dimension : int
+        dimension of the elements of which the quality is evaluated.
+
+    Returns
+    -------
+    dict
+        number of `nodes`, number of `elements` by element type and the
+        `quality` (minimum, mean and percentiles of the minimal scaled
+        Jacobian, where 1 is optimal) of the elements of `dimension`.
+    """
+    node_tags, coords, _ = gmsh.model.mesh.getNodes()
+    statistics = {
+        'nodes': len(node_tags),
+        'elements': dict(),
+        'quality': dict()
+    }
+    qualities = list()
+    element_types, element_tags, _ = gmsh.model.mesh.getElements()
+    for element_type, tags in zip(element_types, element_tags):
+        name, element_dimension = gmsh.model.mesh.getElementProperties(
+            element_type
+        )[:2]
+        statistics['elements'][name] = len(tags)
+        if element_dimension == dimension and len(tags):
+            qualities.append(_element_qualities(
+                element_type, tags, node_tags, coords
+            ))
+    qualities = np.concatenate(qualities) if qualities else []
+    if len(qualities):
+        minimum, p5, p50, p95 = np.percentile(qualities, [0, 5, 50, 95])
+        statistics['quality'] = {
+            'min': float(minimum),
+            'mean': float(np.mean(qualities)),
+            'p5': float(p5),
+            'p50': float(p50),
+            'p95': float(p95)
+        }
+    return statistics
+
+
+def _element_qualities(element_type, tags, node_tags, coords):
+    try:
+        return np.asarray(
+            gmsh.model.mesh.getElementQualities(tags, "minSICN")
+        )
+    except AttributeError:
+        # only available for gmsh >= 4.9, otherwise linear triangles,
+        # quadrangles, tetrahedra, hexahedra and prisms are evaluated
+        if element_type in SIMPLICES:
+            corners = SIMPLICES[element_type]
+        elif element_type in CORNERS:
+            corners = len(CORNERS[element_type][0])
+        else:
+            return np.zeros(0)
+        _, element_nodes = gmsh.model.mesh.getElementsByType(element_type)
+        index = np.zeros(int(node_tags.max()) + 1, dtype=int)
+        index[node_tags] = np.arange(len(node_tags))
+        elements = np.reshape(coords, (-1, 3))[
+            index[element_nodes].reshape(-1, corners)
+        ]
+        if element_type in SIMPLICES:
+            return simplex_qualities(elements)
+        return corner_qualities(elements, *CORNERS[element_type])
+
+
+@lru_cache(maxsize=None)
+def build_code(mesh_class):
+    """
+    Returns the source code of the methods of a mesh class, which
+    determine its generated mesh, e.g. as part of the key of a cache.
+    """
+    return "".join(
+        inspect.getsource(getattr(mesh_class, name))
+        for name in [
+            '_build_model', '_set_mesh_options', '_generate',
+            '_write_meshes'
+        ]
+    )
+
+
+def simplex_qualities(simplices):
+    """
+    Calculates the shape quality of triangles or tetrahedra in the range
+    of 0 (degenerated) to 1 (regular) by the ratio of their area or
+    volume to the sum of their squared edge lengths.
+
+    Parameters
+    ----------
+    simplices : np.ndarray
+        corner points of the triangles (n, 3, 3) or tetrahedra (n, 4, 3).
+    """
+    corners = simplices.shape[1]
+    edges = np.stack([
+        simplices[:, j] - simplices[:, i]
+        for i in range(corners) for j in range(i + 1, corners)
+    ], axis=1)
+    squared_lengths = np.einsum("nij,nij->n", edges, edges)
+    if corners == 3:
+        area = 0.5*np.linalg.norm(
+            np.cross(edges[:, 0], edges[:, 1]), axis=-1
+        )
+        return 4*np.sqrt(3)*area/squared_lengths
+    volume = np.abs(np.einsum(
+        "ni,ni->n", edges[:, 0], np.cross(edges[:, 1], edges[:, 2])
+    ))/6
+    return 12*np.cbrt(3*volume)**2/squared_lengths
+
+
+def corner_qualities(elements, adjacent, ideal=1):
+    """
+    Calculates the minimal scaled Jacobian of the corners of
+    quadrangles, hexahedra or prisms in the range of 0 (degenerated)
+    to 1 (ideal), i.e. the area or volume spanned by the normalized
+    edges at each corner relative to that of the `ideal` element.
+    Inverted corners are not distinguished from valid ones.
+
+    Parameters
+    ----------
+    elements : np.ndarray
+        corner points of the elements (n, corners, 3).
+    adjacent : list of list of int
+        adjacent corners of each corner, e.g. as in `CORNERS`.
+    ideal : float
+        scaled Jacobian of the corners of the ideal element.
+    """
+    adjacent = np.asarray(adjacent)
+    edges = elements[:, adjacent] - elements[:, :, None]
+    edges /= np.linalg.norm(edges, axis=-1, keepdims=True)
+    if adjacent.shape[1] == 2:
+        jacobians = np.linalg.norm(
+            np.cross(edges[..., 0, :], edges[..., 1, :]), axis=-1
+        )
+    else:
+        jacobians = np.abs(np.einsum(
+            "nci,nci->nc", edges[..., 0, :],
+            np.cross(edges[..., 1, :], edges[..., 2, :])
+        ))
+    return np.minimum(jacobians.min(axis=1)/ideal, 1)
+
+
 class BaseMesh(ABCHasStrictTraits):
 
     units = Enum(SUPPORTED_UNITS)
@@ -55,6 +238,28 @@ class BaseMesh(ABCHasStrictTraits):
 
     resolution = Float(5)
 
+    context = Instance(GMSHContext)
+
+    export_geo = Bool(True)
+
+    mesh_dimension = Enum(3, 2)
+
+    num_threads = Int(os.cpu_count() or 1)
+
+    algorithm_3d = Enum(None, *ALGORITHMS_3D)
+
+    stl_encoding = Enum('ascii', 'binary')
+
+    output_formats = List(Enum(MESH_FORMATS), value=['stl'], minlen=1)
+
+    output_files = List
+
+    cache = Instance(MeshCache)
+
+    collect_statistics = Bool(True)
+
+    mesh_statistics = Dict
+
     @abstractmethod
     def _get_volume(self):
         """Returns volume of mesh"""
@@ -70,6 +275,168 @@ class BaseMesh(ABCHasStrictTraits):
         """Returns conversion factor depending on units"""
         return CONVERSIONS[self.units]
 
+    @contextmanager
+    def _gmsh_job(self):
+        """
+        Runs a job in the persistent gmsh-`context` if given, otherwise
+        gmsh is initialized and finalized for this job only.
+        """
+        if self.context is not None:
+            with self.context.job() as context:
+                yield context
+        else:
+            with GMSHContext() as context:
+                yield context
+
+    def write_mesh(self, target_path):
+        """
+        Builds the geometry in memory through the geometry-API of gmsh,
+        meshes it once and writes it as `new_surface.<format>` into
+        `target_path` for each of the `output_formats` (.stl by default,
+        binary .msh in version 4 and ASCII .vtk). The `new_surface.geo`
+        is written as side output only if `export_geo` is enabled.
+
+        With `mesh_dimension = 2`, only the surface mesh is generated,
+        which is sufficient for the .stl-output, while the volume mesh
+        is only generated with `mesh_dimension = 3` (e.g. for .msh or
+        .vtk volume meshes).
+
+        The .stl-file is binary-encoded for `stl_encoding = 'binary'`,
+        which is about 3.5 to 5 times smaller than its ASCII-counterpart.
+
+        The paths of all written files are listed in `output_files`.
+        If a `cache` is given, the files of an identical mesh are
+        materialized from the cache instead of meshing again.
+
+        If `collect_statistics` is enabled, the number of nodes, the
+        number of elements per type and the distribution of the element
+        quality are stored in `mesh_statistics` after the generation
+        (but not for meshes from the cache).
+        """
+        with span('write_mesh', mesh=type(self).__name__):
+            self._write_mesh(target_path)
+
+    def _write_mesh(self, target_path):
+        self.output_files = []
+        self.mesh_statistics = {}
+        if self.cache is not None:
+            with span('cache_materialize'):
+                key = self.cache.key(self._fingerprint())
+                cached_files = self.cache.materialize(key, target_path)
+            if cached_files is not None:
+                self.output_files = cached_files
+                self._calc_properties()
+                return
+        self._remove_outputs(target_path)
+        if self.export_geo:
+            with span('write_geo'):
+                self._write_geo(target_path)
+        self._write_meshes(target_path)
+        self._calc_properties()
+        if self.cache is not None:
+            with span('cache_store'):
+                self.cache.store(key, self.output_files)
+
+    def _remove_outputs(self, target_path):
+        """
+        Removes previous output files from `target_path` before writing,
+        since they may be hardlinks into a `cache`, whose entries must
+        not be modified in-place.
+        """
+        for extension in ['geo'] + self.output_formats:
+            try:
+                os.remove(
+                    os.path.join(target_path, f'new_surface.{extension}')
+                )
+            except FileNotFoundError:
+                pass
+
+    def _fingerprint(self):
+        """Describes all inputs which determine the written files"""
+        with open(self.source_geo, "r") as template:
+            template = template.read()
+        return {
+            'class': type(self).__name__,
+            'lengths': {
+                name: float(getattr(self, name))
+                for name in self.geometry_traits + ['resolution']
+            },
+            'options': self.trait_get(
+                'export_geo', 'mesh_dimension', 'algorithm_3d',
+                'stl_encoding', 'output_formats'
+            ),
+            'template': template,
+            'build_code': build_code(type(self)),
+            'gmsh': gmsh.__version__
+        }
+
+    def _write_meshes(self, target_path):
+        with self._gmsh_job() as context:
+            with span('build_model'):
+                self._build_model(context)
+            self._set_mesh_options(context)
+            with span('generate', dimension=self.mesh_dimension):
+                self._generate(context)
+            if self.collect_statistics:
+                with span('mesh_statistics'):
+                    self.mesh_statistics = mesh_statistics(
+                        self.mesh_dimension
+                    )
+            for mesh_format in self.output_formats:
+                target_file = os.path.join(
+                    target_path, f'new_surface.{mesh_format}'
+                )
+                if mesh_format == 'stl':
+                    context.set_option(
+                        "Mesh.Binary", int(self.stl_encoding == 'binary')
+                    )
+                else:
+                    context.set_option(
+                        "Mesh.Binary", int(mesh_format == 'msh')
+                    )
+                if mesh_format == 'msh':
+                    context.set_option("Mesh.MshFileVersion", 4.1)
+                with span('gmsh_write', format=mesh_format):
+                    gmsh.write(target_file)
+                self.output_files.append(target_file)
+
+    def _set_mesh_options(self, context):
+        """
+        Applies the number of threads for all meshing stages and
+        the `algorithm_3d` (if given) to the current job.
+        """
+        context.set_option("General.NumThreads", self.num_threads)
+        for dimension in ["1D", "2D", "3D"]:
+            context.set_option(
+                f"Mesh.MaxNumThreads{dimension}", self.num_threads
+            )
+        if self.algorithm_3d:
+            context.set_option(
+                "Mesh.Algorithm3D", ALGORITHMS_3D[self.algorithm_3d]
+            )
+
+    def _generate(self, context):
+        gmsh.model.mesh.generate(self.mesh_dimension)
+
+    @abstractmethod
+    def _build_model(self, context):
+        """Adds the geometry to the current gmsh-model"""
+
+    @abstractmethod
+    def _write_geo(self, target_path):
+        """Writes the geometry into a .geo-file"""
+
+    def _calc_properties(self):
+        """Calculates the extent and inside location of the geometry"""
+
+    def inspect_file(self):
+        """
+        Determines the extent and inside location of the geometry
+        analytically without generating a mesh, so that gmsh is
+        not even loaded.
+        """
+        self._calc_properties()
+
 
 class RectangularMesh(BaseMesh):
 
@@ -77,6 +444,8 @@ class RectangularMesh(BaseMesh):
 
     y_length = Float(1)
 
+    geometry_traits = ['x_length', 'y_length', 'z_length']
+
     source_geo = os.path.join(
         os.path.dirname(__file__),
         "resources",
@@ -87,11 +456,6 @@ class RectangularMesh(BaseMesh):
     def _get_volume(self):
         return self.x_length * self.y_length * self.z_length
 
-    def write_mesh(self, target_path):
-        self._write_geo(target_path)
-        self._write_stl(target_path)
-        self._calc_properties()
-
     def _write_geo(self, target_path):
         target_geo = os.path.join(target_path, 'new_surface.geo')
         with open(self.source_geo, "r") as template,\
@@ -106,6 +470,7 @@ class RectangularMesh(BaseMesh):
                 elif "resolution = " in line:
                     line = f"resolution = {self.resolution};\n"
                 file.write(line)
+        self.output_files.append(target_geo)
 
     # OVERRIDE
     def _get_filling_extent(self):
@@ -117,18 +482,39 @@ class RectangularMesh(BaseMesh):
             ]
         )
 
-    def _write_stl(self, target_path):
-        target_geo = os.path.join(
-            target_path, 'new_surface.geo'
+    def _build_model(self, context):
+        """Equivalent of the `rectangle_backup.geo`-template"""
+        nodes_x_length = int(self.x_length/self.resolution+1)
+        nodes_y_length = int(self.y_length/self.resolution+1)
+        nodes_z_length = int(self.z_length/self.resolution)
+        geo = gmsh.model.geo
+        geo.addPoint(0, 0, 0, tag=101)
+        geo.addPoint(0, self.y_length, 0, tag=102)
+        geo.addPoint(self.x_length, self.y_length, 0, tag=103)
+        geo.addPoint(self.x_length, 0, 0, tag=104)
+        geo.addLine(101, 102, tag=201)
+        geo.addLine(102, 103, tag=202)
+        geo.addLine(103, 104, tag=203)
+        geo.addLine(104, 101, tag=204)
+        geo.addCurveLoop([201, 202, 203, 204], tag=2011)
+        geo.addPlaneSurface([2011], tag=301)
+        geo.mesh.setTransfiniteCurve(201, nodes_y_length)
+        geo.mesh.setTransfiniteCurve(203, nodes_y_length)
+        geo.mesh.setTransfiniteCurve(202, nodes_x_length)
+        geo.mesh.setTransfiniteCurve(204, nodes_x_length)
+        geo.mesh.setTransfiniteSurface(301)
+        geo.mesh.setRecombine(2, 301)
+        geo.extrude(
+            [(2, 301)], 0, 0, self.z_length,
+            numElements=[nodes_z_length], recombine=True
         )
-        target_stl = os.path.join(
-            target_path, 'new_surface.stl'
-        )
-        gmsh.initialize()
-        gmsh.open(target_geo)
-        gmsh.model.mesh.generate(3)
-        gmsh.write(target_stl)
-        gmsh.finalize()
+        geo.synchronize()
+        context.set_option("Mesh.Algorithm3D", 1)
+
+    # OVERRIDE
+    def _generate(self, context):
+        super()._generate(context)
+        gmsh.model.mesh.removeDuplicateNodes()
 
     def _calc_properties(self):
         self.max_extent = extent(
@@ -153,6 +539,8 @@ class CylinderMesh(BaseMesh):
 
     xy_radius = Float(150)
 
+    geometry_traits = ['xy_radius', 'z_length']
+
     source_geo = os.path.join(
         os.path.dirname(__file__),
         "resources",
@@ -178,11 +566,6 @@ class CylinderMesh(BaseMesh):
             ]
         )
 
-    def write_mesh(self, target_path):
-        self._write_geo(target_path)
-        self._write_stl(target_path)
-        self._calc_properties()
-
     def _write_geo(self, target_path):
         target_geo = os.path.join(target_path, 'new_surface.geo')
         with open(self.source_geo, "r") as template,\
@@ -195,19 +578,31 @@ class CylinderMesh(BaseMesh):
                 elif "resolution = " in line:
                     line = f"resolution = {self.resolution};\n"
                 file.write(line)
-
-    def _write_stl(self, target_path):
-        target_geo = os.path.join(
-            target_path, 'new_surface.geo'
+        self.output_files.append(target_geo)
+
+    def _build_model(self, context):
+        """Equivalent of the `cylinder_closed_backup.geo`-template"""
+        cl = self.resolution
+        nodes_z_length = int(self.z_length/self.resolution)
+        geo = gmsh.model.geo
+        geo.addPoint(0, 0, 0, cl, tag=1)
+        geo.addPoint(self.xy_radius, 0, 0, cl, tag=2)
+        geo.addPoint(0, self.xy_radius, 0, cl, tag=3)
+        geo.addPoint(-self.xy_radius, 0, 0, cl, tag=4)
+        geo.addPoint(0, -self.xy_radius, 0, cl, tag=5)
+        geo.addCircleArc(2, 1, 3, tag=1)
+        geo.addCircleArc(3, 1, 4, tag=2)
+        geo.addCircleArc(4, 1, 5, tag=3)
+        geo.addCircleArc(5, 1, 2, tag=4)
+        geo.addCurveLoop([1, 2, 3, 4], tag=5)
+        geo.addPlaneSurface([5], tag=6)
+        geo.mesh.setTransfiniteSurface(6)
+        geo.mesh.setRecombine(2, 6)
+        geo.extrude(
+            [(2, 6)], 0, 0, self.z_length,
+            numElements=[nodes_z_length], recombine=True
         )
-        target_stl = os.path.join(
-            target_path, 'new_surface.stl'
-        )
-        gmsh.initialize()
-        gmsh.open(target_geo)
-        gmsh.model.mesh.generate(3)
-        gmsh.write(target_stl)
-        gmsh.finalize()
+        geo.synchronize()
 
     def _calc_properties(self):
         self.inside_location = [
@@ -231,9 +626,153 @@ class ComplexMesh(BaseMesh):
 
     source_path = File
 
+    streaming = Bool(False)
+
+    block_size = Int(2**20)
+
+    volume_profile = Property(Instance(VolumeProfile))
+
+    # signature of the source file and the values derived from it
+    _volume = Tuple(Any, Any)
+
+    _volume_profile = Tuple(Any, Any)
+
     # OVERRIDE
     def _get_volume(self):
-        return self._calc_volume(np.inf)
+        return self._memoized(
+            '_volume', lambda: self._calc_volume(np.inf)
+        )
+
+    def _get_volume_profile(self):
+        return self._memoized(
+            '_volume_profile', lambda: VolumeProfile(self._load_facets())
+        )
+
+    def _memoized(self, name, calculate):
+        """
+        Returns the value stored under `name` if it has been calculated
+        from the current source file, i.e. with the same path, size and
+        modification time, and recalculates it otherwise.
+        """
+        signature = self._signature()
+        memo_signature, value = getattr(self, name)
+        if memo_signature != signature:
+            value = calculate()
+            setattr(self, name, (signature, value))
+        return value
+
+    def _signature(self):
+        stat = os.stat(self.source_path)
+        return (
+            os.path.abspath(self.source_path),
+            stat.st_size,
+            stat.st_mtime_ns
+        )
+
+    def _facet_blocks(self):
+        """
+        Yields the facets of the .stl-file either in blocks of
+        `block_size` facets if `streaming` is enabled (e.g. for
+        files exceeding the memory) or all at once from the cache.
+        """
+        if self.streaming and self._is_stl:
+            yield from iter_stl(self.source_path, self.block_size)
+        else:
+            yield self._load_facets()
+
+    # OVERRIDE
+    def write_mesh(self, target_path):
+        """
+        The geometry of a `ComplexMesh` is already given as mesh by its
+        `source_path`, so that it is rejected before anything is written.
+        Please use `inspect_file` instead.
+        """
+        raise self._not_meshable()
+
+    # OVERRIDE
+    def _build_model(self, context):
+        raise self._not_meshable()
+
+    # OVERRIDE
+    def _write_geo(self, target_path):
+        raise self._not_meshable()
+
+    def _not_meshable(self):
+        return ValueError(
+            f'{type(self).__name__} is given by {self.source_path} '
+            'and can not be meshed'
+        )
+
+    @property
+    def _is_stl(self):
+        return self.source_path.lower().endswith('.stl')
+
+    def _load_facets(self):
+        """
+        Loads all facets of the source file from the cache, whereas
+        other formats than .stl (e.g. .msh or .vtk) are read by gmsh.
+        """
+        if self._is_stl:
+            return load_stl(self.source_path)
+        return GEOMETRY_CACHE.get(
+            self.source_path, loader=self._read_with_gmsh
+        )
+
+    def _read_with_gmsh(self, source_path):
+        """
+        Reads the surface facets of other mesh formats (e.g. .msh or .vtk)
+        through gmsh. If the mesh contains volumes, their boundary is taken
+        with outward orientation. Quadrangles are split into two triangles.
+        """
+        facets = list()
+        with self._gmsh_job():
+            gmsh.open(source_path)
+            surfaces = gmsh.model.getBoundary(
+                gmsh.model.getEntities(3), combined=True, oriented=True
+            ) or gmsh.model.getEntities(2)
+            node_tags, coords, _ = gmsh.model.mesh.getNodes()
+            if not len(node_tags):
+                # e.g. STEP-, IGES- or .geo-files without a mesh
+                return np.zeros((0, 3, 3))
+            index = np.zeros(int(node_tags.max()) + 1, dtype=int)
+            index[node_tags] = np.arange(len(node_tags))
+            coords = np.reshape(coords, (-1, 3))
+            for _, tag in surfaces:
+                for element_type, corners in [(2, 3), (3, 4)]:
+                    _, nodes = gmsh.model.mesh.getElementsByType(
+                        element_type, abs(tag)
+                    )
+                    nodes = index[nodes].reshape(-1, corners)
+                    if corners == 4:
+                        nodes = np.concatenate(
+                            [nodes[:, [0, 1, 2]], nodes[:, [0, 2, 3]]]
+                        )
+                    if tag < 0:
+                        nodes = nodes[:, ::-1]
+                    facets.append(coords[nodes])
+        if not facets:
+            return np.zeros((0, 3, 3))
+        return np.concatenate(facets)
+
+    def volume_below(self, level):
+        """
+        Returns the volume of the geometry underneath one or more
+        absolute heights `level` (in units of the .stl-file), whereas
+        facets crossing the level are clipped exactly.
+        Please see `gmsh_stl.VolumeProfile` for further information.
+
+        The profile is built from the complete geometry,
+        also if `streaming` is enabled.
+        """
+        return self.volume_profile.volume_below(level)
+
+    def height_for_volume_fraction(self, fraction):
+        """
+        Returns the absolute height(s), underneath which the relative
+        `fraction` (between 0 and 1) of the total volume is located.
+        This is the inverse of `ComplexMesh.volume_below`.
+        """
+        return self.volume_profile.height_for_volume_fraction(fraction)
 
     # OVERRIDE
     def _get_filling_extent(self):
@@ -256,8 +795,9 @@ class ComplexMesh(BaseMesh):
     def _calc_volume(self, cutoff_level):
         """
         This method calculates the metric volume of an abstract geometry
-        described by an .stl-file. This is achieved by calculating the sum
-        of all determinates for each triangular facet, multiplied by 1/6.
+        described by an ASCII- or binary-encoded .stl-file. This is achieved
+        by calculating the sum of all determinates for each triangular facet,
+        multiplied by 1/6.
         The method is a common mathematical approach for volume calculation
         of objects constructed by delauney-triangulation.
 
@@ -303,27 +843,11 @@ class ComplexMesh(BaseMesh):
             (e.g. when `ComplexMesh.units = 'mm'`, the given
             volume is in mm^3.)
         """
-        with open(self.source_path, "r") as source:
-            volume = 0
-            points = list()
-            for line in source:
-                line_split = line.split(sep=" ")
-                line_split[-1] = line_split[-1].replace("\n", "")
-                if "vertex" in line_split:
-                    coords = list(
-                        map(
-                            float,
-                            line_split[-3:]
-                        )
-                    )
-                    if coords[-1] <= cutoff_level:
-                        points.append(coords)
-                elif "endloop" in line_split \
-                        or "outer loop" in line_split:
-                    points = list()
-                if len(points) == 3:
-                    volume += linalg.det(np.array(points))/6
-        return abs(volume)
+        with span('calc_volume', cutoff_level=cutoff_level):
+            statistics = facet_statistics(
+                self._facet_blocks(), [cutoff_level]
+            )
+        return float(abs(statistics.cutoff_volumes[0]))
 
     def cutoff_volume(self, cutoff_value):
         """
@@ -366,7 +890,7 @@ class ComplexMesh(BaseMesh):
             L is the length unit given by `ComplexMesh.units`.
         """
         if not self.max_extent:
-            self._inspect_file()
+            self.inspect_file()
         cutoff_level = (
             self.z_length*cutoff_value +
             self.max_extent["z"]["min"]
@@ -374,11 +898,29 @@ class ComplexMesh(BaseMesh):
         return self._calc_volume(cutoff_level)
 
     def inspect_file(self):
-        gmsh.initialize()
-        gmsh.open(self.source_path)
-        bounding_box = gmsh.model.getBoundingBox(2, 1)
+        """
+        Determines the maximum extent of the geometry by the minimum
+        and maximum of all vertices, whereas the volume is calculated
+        in the same pass. `gmsh` is only used as fallback for files
+        which do not contain any .stl-facets.
+        """
+        signature = self._signature()
+        with span('inspect_file', source_path=self.source_path):
+            statistics = facet_statistics(self._facet_blocks())
+        if np.all(np.isfinite(statistics.min_extent)):
+            self.max_extent = extent(
+                min_extent=statistics.min_extent,
+                max_extent=statistics.max_extent
+            )
+            self._volume = (signature, abs(statistics.volume))
+        else:
+            self._inspect_with_gmsh()
+
+    def _inspect_with_gmsh(self):
+        with self._gmsh_job(), span('inspect_with_gmsh'):
+            gmsh.open(self.source_path)
+            bounding_box = gmsh.model.getBoundingBox(-1, -1)
         self.max_extent = extent(
             min_extent=bounding_box[:3],
             max_extent=bounding_box[3:]
         )
-        gmsh.finalize()
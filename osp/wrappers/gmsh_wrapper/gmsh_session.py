@@ -1,11 +1,16 @@
+from concurrent.futures import Future, ProcessPoolExecutor
 import os
-from decimal import Decimal
-import numpy as np
+import threading
 from osp.core.session import WrapperSession
 from osp.core.namespaces import emmo
 from osp.wrappers.gmsh_wrapper.gmsh_engine import (
-    RectangularMesh, CylinderMesh, ComplexMesh, CONVERSIONS, extent
+    RectangularMesh, CylinderMesh, ComplexMesh, extent
 )
+from osp.wrappers.gmsh_wrapper.gmsh_context import GMSHContext
+from osp.wrappers.gmsh_wrapper.gmsh_units import to_meters, si_unit
+from osp.wrappers.gmsh_wrapper.gmsh_cuds_index import CudsIndex
+from osp.wrappers.gmsh_wrapper.gmsh_tracing import span
+from osp.wrappers.gmsh_wrapper.gmsh_batch import run_mesh
 
 
 MAPPING = extent(
@@ -20,72 +25,275 @@ MAPPING = extent(
         emmo.hasMaximumZCoordinate
     ]
 )
+# names of the geometry file format classes and their file extensions
+FILE_FORMATS = {
+    'STL': 'stl',
+    'MSH': 'msh',
+    'VTK': 'vtk'
+}
+
+
+class MeshFuture(Future):
+
+    """
+    Future of the meshes of an asynchronous run, which combines the
+    futures of the single meshing jobs.
+
+    Parameters
+    ----------
+    futures : list of concurrent.futures.Future
+        futures of the single meshing jobs in the worker processes.
+    on_results : callable
+        receives the list of meshes before the future is done. It is
+        set before the jobs are wired, which may already be finished.
+    """
+
+    def __init__(self, futures, on_results=None):
+        super().__init__()
+        self._futures = futures
+        self._pending = len(futures)
+        self._on_results = on_results
+        self._status_lock = threading.Lock()
+        for future in futures:
+            future.add_done_callback(self._job_done)
+        if not futures:
+            self._finish()
+
+    @property
+    def status(self):
+        """One of 'pending', 'running', 'cancelled', 'failed' or 'done'"""
+        if self.cancelled():
+            return 'cancelled'
+        if self.done():
+            return 'failed' if self.exception() else 'done'
+        if any(future.running() or future.done()
+               for future in self._futures):
+            return 'running'
+        return 'pending'
+
+    def cancel(self):
+        """
+        Cancels all pending jobs, whereas the results of running
+        jobs are discarded.
+        """
+        cancelled = super().cancel()
+        if cancelled:
+            for future in self._futures:
+                future.cancel()
+        return cancelled
+
+    def _job_done(self, future):
+        with self._status_lock:
+            self._pending -= 1
+            finished = self._pending == 0
+        if finished:
+            self._finish()
+
+    def _finish(self):
+        if not self.set_running_or_notify_cancel():
+            return
+        try:
+            meshes = [future.result() for future in self._futures]
+            if self._on_results is not None:
+                self._on_results(meshes)
+        except BaseException as error:
+            self.set_exception(error)
+        else:
+            self.set_result(meshes)
 
 
 class GMSHSession(WrapperSession):
 
     """
     Session class for GMSH.
+
+    With `dry_run` enabled, or if no output directory is given, no mesh
+    is generated and only the metadata (extents, inside location and
+    volume) is assigned. For rectangles and cylinders, this metadata is
+    calculated analytically without loading gmsh.
+
+    All mesh generations of the wrapper are processed in one `run`,
+    whereas several meshes are written concurrently in a pool of up to
+    `processes` worker processes (by default one per CPU). With
+    `run_async`, the meshes are generated in the background instead.
+    The pool lives as long as the session, so that each worker keeps
+    its gmsh-kernel initialized across runs.
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, dry_run=False, processes=None, **kwargs):
         super().__init__(engine=None, **kwargs)
+        self.dry_run = dry_run
+        self.processes = processes
         self._geometry = None
         self._target_path = None
+        self._context = GMSHContext()
+        self._executor = None
+        # pending asynchronous runs
+        self._futures = set()
+        # index of the computation which is currently parsed
+        self._index = None
+        # unit individuals shared by all results of the session
+        self._units = dict()
+        # guards the registry against concurrent commits of results
+        self._lock = threading.RLock()
 
     def __str__(self):
         return "OSP-wrapper for GMSH"
 
     def run(self):
-        """Run the computation"""
+        """
+        Run all mesh generations of the wrapper, whereas the meshes
+        are written concurrently in worker processes if there are
+        several of them.
+        """
+        with self._lock, span('parse_cuds'):
+            jobs, entities = self._parse_computations()
+        with span('run_jobs', jobs=len(jobs)):
+            meshes = self._run_jobs(jobs)
+        with self._lock, span('emit_results'):
+            self._assign_results(meshes, entities)
+
+    def run_async(self):
+        """
+        Runs all mesh generations of the wrapper in background worker
+        processes without blocking. The CUDS-input is parsed right
+        away, while the results are committed to the session when
+        all meshes are finished.
+
+        Returns
+        -------
+        MeshFuture
+            future of the list of meshes, which is done as soon as
+            their results have been committed. Cancelling it discards
+            the results of meshes which are already being generated.
+        """
+        with self._lock, span('parse_cuds'):
+            jobs, entities = self._parse_computations()
+
+        def commit(meshes):
+            with self._lock, span('emit_results'):
+                self._assign_results(meshes, entities)
+
+        executor = self._get_executor()
+        futures = [executor.submit(run_mesh, job) for job in jobs]
+        future = MeshFuture(futures, on_results=commit)
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        return future
+
+    def _parse_computations(self):
         # get CUDS-root object
         root = self._registry.get(self.root)
-        # get entity for GMSH computation
-        computation = root.get(oclass=emmo.MeshGeneration)
+        # get entities for GMSH computations
+        computations = root.get(oclass=emmo.MeshGeneration)
         # check if mesh generation exits
-        if computation:
+        if not computations:
+            raise ValueError('Currently, only mold models are supported')
+        jobs = list()
+        entities = list()
+        for computation in computations:
             # get geometry data
-            geo_data = computation[0].get(oclass=emmo.GeometryData)
+            geo_data = computation.get(oclass=emmo.GeometryData)
             # get mesh data
-            mesh_data = computation[0].get(oclass=emmo.MeshData)
+            mesh_data = computation.get(oclass=emmo.MeshData)
             # get filling data
-            fill_data = computation[0].get(oclass=emmo.FillingData)
+            fill_data = computation.get(oclass=emmo.FillingData)
             # check if geometry and mesh data exist
-            if geo_data and mesh_data and fill_data:
-                # run the GMSH Mold model
-                self._parse_mold_data(geo_data[0], mesh_data[0], fill_data[0])
-                if self._target_path:
-                    self._geometry.write_mesh(self._target_path)
-                else:
-                    self._geometry.inspect_file()
-                self._parse_extent(self._geometry.max_extent, mesh_data[0])
-                self._parse_extent(self._geometry.filling_extent, fill_data[0])
-                self._assign_inside_location(mesh_data[0])
-                self._assign_volume(geo_data[0])
-            elif not geo_data:
+            if not geo_data:
                 raise ValueError('geometry data not found')
             elif not mesh_data:
                 raise ValueError('GMSH meta data not found')
             elif not fill_data:
                 raise ValueError('Filling meta data not found')
+            # parse the GMSH Mold model
+            self._target_path = None
+            self._index = CudsIndex(computation)
+            try:
+                self._parse_mold_data(
+                    geo_data[0], mesh_data[0], fill_data[0]
+                )
+            finally:
+                self._index = None
+            if self.dry_run:
+                self._target_path = None
+            jobs.append((self._geometry, self._target_path))
+            entities.append((geo_data[0], mesh_data[0], fill_data[0]))
+        self._check_target_paths(jobs)
+        return jobs, entities
+
+    def _check_target_paths(self, jobs):
+        """
+        Rejects jobs which write to the same directory, since their
+        output files would overwrite each other.
+        """
+        target_paths = set()
+        for _, target_path in jobs:
+            if not target_path:
+                continue
+            target_path = os.path.abspath(target_path)
+            if target_path in target_paths:
+                raise ValueError(
+                    f'Several meshes are written to {target_path}'
+                )
+            target_paths.add(target_path)
+
+    def _assign_results(self, meshes, entities):
+        for mesh, (geo_data, mesh_data, fill_data) in zip(meshes, entities):
+            self._geometry = mesh
+            self._parse_extent(self._geometry.max_extent, mesh_data)
+            self._parse_extent(self._geometry.filling_extent, fill_data)
+            self._assign_inside_location(mesh_data)
+            self._assign_volume(geo_data)
+            self._assign_mesh_statistics(mesh_data)
+
+    def _run_jobs(self, jobs):
+        """
+        Writes the meshes of all jobs with a target path, in a pool of
+        worker processes if there are several, and inspects the others.
+        """
+        writing = [job for job in jobs if job[1]]
+        if len(writing) > 1:
+            meshes = self._get_executor().map(run_mesh, writing)
         else:
-            raise ValueError('Currently, only mold models are supported')
+            meshes = iter([])
+        results = list()
+        for mesh, target_path in jobs:
+            if not target_path:
+                mesh.inspect_file()
+            elif len(writing) > 1:
+                mesh = next(meshes)
+                mesh.context = self._context
+            else:
+                mesh.write_mesh(target_path)
+            results.append(mesh)
+        return results
+
+    def _get_executor(self):
+        """
+        Returns the pool of worker processes of this session, which
+        is started with the first parallel run.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.processes)
+        return self._executor
 
     def _parse_mold_data(self, geo_data, mesh_data, fill_data):
         mesh_data = self._parse_mesh_data(mesh_data)
         fill_data = self._parse_fill_data(fill_data)
-        geo = geo_data.get(oclass=emmo.TwoManifold)
+        geo = self._get(geo_data, oclass=emmo.TwoManifold)
         if geo:
-            geo_file = geo_data.get(oclass=emmo.File)
+            geo_file = self._get(geo_data, oclass=emmo.File)
             if geo[0].is_a(emmo.Rectangle) and not geo_file:
                 geo_data = self._parse_rectangle_data(geo_data)
                 self._geometry = RectangularMesh(
-                    **geo_data, **mesh_data, **fill_data
+                    **geo_data, **mesh_data, **fill_data,
+                    context=self._context
                 )
             elif geo[0].is_a(emmo.Cylinder) and not geo_file:
                 geo_data = self._parse_cylinder_data(geo_data)
                 self._geometry = CylinderMesh(
-                    **geo_data, **mesh_data, **fill_data
+                    **geo_data, **mesh_data, **fill_data,
+                    context=self._context
                 )
             elif geo[0].is_a(emmo.Complex) or geo_file:
                 geo_data = {
@@ -93,77 +301,114 @@ class GMSHSession(WrapperSession):
                     'units': self._get_si_unit(geo_data)
                 }
                 self._geometry = ComplexMesh(
-                    **mesh_data, **geo_data, **fill_data
+                    **mesh_data, **geo_data, **fill_data,
+                    context=self._context
                 )
         else:
             raise ValueError(
                 'Target geometry not recognized or geometry file not found'
             )
 
+    def _get(self, entity, rel=None, oclass=None):
+        """Gets the neighbours of an entity from the index if given"""
+        if self._index is not None:
+            return self._index.get(entity, rel=rel, oclass=oclass)
+        kwargs = {'rel': rel, 'oclass': oclass}
+        return entity.get(**{
+            key: value for key, value in kwargs.items() if value
+        })
+
+    def _unit(self, oclass, symbol=None):
+        """
+        Returns the individual of a unit (or prefix), which is created
+        once in this session and shared by all results.
+        """
+        key = (str(oclass), symbol)
+        unit = self._units.get(key)
+        if unit is None or unit.uid not in self._registry:
+            attributes = {'hasSymbolData': symbol} if symbol else {}
+            unit = oclass(session=self, **attributes)
+            self._units[key] = unit
+        return unit
+
+    def _quantity(self, oclass, value, *units):
+        """
+        Creates a quantity with its value directly in this session,
+        so that it does not need to be copied from the core session.
+        """
+        quantity = oclass(session=self)
+        quantity.add(
+            emmo.Real(hasNumericalData=value, session=self),
+            rel=emmo.hasQuantityValue
+        )
+        quantity.add(*units, rel=emmo.hasReferenceUnit)
+        return quantity
+
     def _parse_extent(self, extent, entity):
+        metre = self._unit(emmo.Metre, 'm')
         for axis in extent.keys():
             for direction in extent[axis].keys():
-                length = emmo.Length()
-                real = emmo.Real(
-                    hasNumericalData=extent[axis][direction]
-                )
-                unit = emmo.Metre(hasSymbolData='m')
-                length.add(real, rel=emmo.hasQuantityValue)
-                length.add(unit, rel=emmo.hasReferenceUnit)
                 entity.add(
-                    length,
+                    self._quantity(
+                        emmo.Length, extent[axis][direction], metre
+                    ),
                     rel=MAPPING[axis][direction]
                 )
 
     def _assign_volume(self, geo_data):
-        volume = emmo.Volume()
-        real = emmo.Real(hasNumericalData=self._geometry.volume)
-        unit = emmo.CubicMetre()
-        volume.add(real, rel=emmo.hasQuantityValue)
-        volume.add(unit, rel=emmo.hasReferenceUnit)
+        units = [self._unit(emmo.CubicMetre)]
         if self._geometry.units == 'mm':
-            volume.add(
-                emmo.Milli(hasSymbolData='m'),
-                rel=emmo.hasReferenceUnit
-            )
+            units.append(self._unit(emmo.Milli, 'm'))
         elif self._geometry.units == 'cm':
-            volume.add(
-                emmo.Centi(hasSymbolData='c'),
-                rel=emmo.hasReferenceUnit
-            )
+            units.append(self._unit(emmo.Centi, 'c'))
+        volume = self._quantity(emmo.Volume, self._geometry.volume, *units)
         geo_data.add(volume, rel=emmo.hasQuantitativeProperty)
 
     def _assign_inside_location(self, mesh_data):
         inside_location = mesh_data.get(oclass=emmo.InsidePosition)
         if not inside_location:
-            previous_length = list()
-            inside_point = emmo.InsidePosition()
-            for n, element in enumerate(self._geometry.inside_location):
-                length = emmo.Length()
-                real = emmo.Real(hasNumericalData=element)
-                unit = emmo.Metre(hasSymbolData='m')
-                length.add(real, rel=emmo.hasQuantityValue)
-                length.add(unit, rel=emmo.hasReferenceUnit)
-                if n == 0:
-                    relation = emmo.hasSpatialFirst
-                elif n == 2:
-                    relation = emmo.hasSpatialLast
-                else:
-                    relation = emmo.hasSpatialDirectPart
-                if n > 0:
-                    previous_length[-1].add(
-                        length,
-                        rel=emmo.hasSpatialNext
-                    )
-                previous_length.append(length)
-                inside_point.add(length, rel=relation)
+            metre = self._unit(emmo.Metre, 'm')
+            first, middle, last = [
+                self._quantity(emmo.Length, element, metre)
+                for element in self._geometry.inside_location
+            ]
+            first.add(middle, rel=emmo.hasSpatialNext)
+            middle.add(last, rel=emmo.hasSpatialNext)
+            inside_point = emmo.InsidePosition(session=self)
+            inside_point.add(first, rel=emmo.hasSpatialFirst)
+            inside_point.add(middle, rel=emmo.hasSpatialDirectPart)
+            inside_point.add(last, rel=emmo.hasSpatialLast)
             mesh_data.add(inside_point)
 
+    def _assign_mesh_statistics(self, mesh_data):
+        """
+        Adds the statistics of a generated mesh as dimensionless
+        quantities, which are named by their sign, e.g. `nodes`,
+        `elements/Tetrahedron 4` or `quality/min`.
+        """
+        statistics = self._geometry.mesh_statistics
+        if not statistics:
+            return
+        values = {'nodes': statistics['nodes']}
+        for group in ['elements', 'quality']:
+            values.update({
+                f'{group}/{name}': value
+                for name, value in statistics[group].items()
+            })
+        unit_one = self._unit(emmo.UnitOne)
+        for name, value in values.items():
+            quantity = self._quantity(emmo.Quantity, value, unit_one)
+            quantity.add(
+                emmo.String(hasSymbolData=name, session=self),
+                rel=emmo.hasSign
+            )
+            mesh_data.add(quantity, rel=emmo.hasQuantitativeProperty)
+
     def _parse_mesh_data(self, mesh_data):
         mesh_dict = dict()
-        resolution = mesh_data.get(oclass=emmo.Resolution)
-        inside_point = mesh_data.get(oclass=emmo.InsidePosition)
-        geo_file = mesh_data.get(oclass=emmo.File)
+        resolution = self._get(mesh_data, oclass=emmo.Resolution)
+        inside_point = self._get(mesh_data, oclass=emmo.InsidePosition)
+        geo_file = self._get(mesh_data, oclass=emmo.File)
         if resolution:
             mesh_dict['resolution'] = self._to_meters(resolution[0])
         if inside_point:
@@ -174,10 +419,21 @@ class GMSHSession(WrapperSession):
             self._target_path = self._parse_geometry_file(
                 geo_file[0], only_dir=True
             )
+            mesh_dict['stl_encoding'] = self._parse_file_encoding(
+                geo_file[0]
+            )
+            mesh_dict['output_formats'] = self._parse_file_formats(
+                geo_file[0]
+            )
+            # the surface mesh is sufficient for .stl-files only
+            if mesh_dict['output_formats'] == ['stl']:
+                mesh_dict['mesh_dimension'] = 2
         return mesh_dict
 
     def _parse_fill_data(self, fill_data):
-        filling_fraction = fill_data.get(oclass=emmo.FillingFraction)
+        filling_fraction = self._get(
+            fill_data, oclass=emmo.FillingFraction
+        )
         if filling_fraction:
             filling_fraction = self._get_real_value(
                 filling_fraction[0]
@@ -190,9 +446,9 @@ class GMSHSession(WrapperSession):
 
     def _parse_rectangle_data(self, geometry_data):
         x_length = y_length = z_length = 1
-        x_length_data = geometry_data.get(rel=emmo.hasXLength)
-        y_length_data = geometry_data.get(rel=emmo.hasYLength)
-        z_length_data = geometry_data.get(rel=emmo.hasZLength)
+        x_length_data = self._get(geometry_data, rel=emmo.hasXLength)
+        y_length_data = self._get(geometry_data, rel=emmo.hasYLength)
+        z_length_data = self._get(geometry_data, rel=emmo.hasZLength)
         if x_length_data:
             x_length = self._to_meters(x_length_data[0])
         if y_length_data:
@@ -208,8 +464,8 @@ class GMSHSession(WrapperSession):
 
     def _parse_cylinder_data(self, geometry_data):
         z_length = xy_radius = 1
-        xy_radius_data = geometry_data.get(rel=emmo.hasXYRadius)
-        z_length_data = geometry_data.get(rel=emmo.hasZLength)
+        xy_radius_data = self._get(geometry_data, rel=emmo.hasXYRadius)
+        z_length_data = self._get(geometry_data, rel=emmo.hasZLength)
         if xy_radius_data:
             xy_radius = self._to_meters(xy_radius_data[0])
         if z_length_data:
@@ -221,22 +477,22 @@ class GMSHSession(WrapperSession):
         }
 
     def _parse_geometry_file(self, geometry_file, only_dir=None):
-        dir_seq = geometry_file.get(oclass=emmo.DirectorySequence)
+        dir_seq = self._get(geometry_file, oclass=emmo.DirectorySequence)
         if dir_seq:
             directory = self._parse_directory_sequence(dir_seq[0])
         else:
             raise ValueError('File directory sequence not defined')
         if not only_dir:
-            name_data = geometry_file.get(oclass=emmo.String)
-            format_data = geometry_file.get(oclass=emmo.GeometryFileFormat)
+            name_data = self._get(geometry_file, oclass=emmo.String)
+            format_data = self._get(
+                geometry_file, oclass=emmo.GeometryFileFormat
+            )
             if name_data:
                 name = name_data[0].hasSymbolData
             else:
                 raise ValueError('File name not found')
             if format_data:
-                if not format_data[0].is_a(emmo.STL):
-                    raise ValueError('Only STL-files supported for the moment')
-                file_format = 'stl'
+                file_format = self._parse_file_formats(geometry_file)[0]
             else:
                 raise ValueError(
                     'File format not defined'
@@ -246,14 +502,39 @@ class GMSHSession(WrapperSession):
         else:
             return directory
 
+    def _parse_file_formats(self, geometry_file):
+        format_data = self._get(
+            geometry_file, oclass=emmo.GeometryFileFormat
+        )
+        file_formats = list()
+        for file_format in format_data:
+            name = file_format.oclass.name
+            if name not in FILE_FORMATS:
+                raise ValueError(f'File format {name} not supported')
+            file_formats.append(FILE_FORMATS[name])
+        return sorted(file_formats) or ['stl']
+
+    def _parse_file_encoding(self, geometry_file):
+        format_data = self._get(geometry_file, oclass=emmo.STL)
+        if format_data:
+            encoding = self._get(format_data[0], oclass=emmo.String)
+            if encoding:
+                encoding = encoding[0].hasSymbolData
+                if encoding not in ['ascii', 'binary']:
+                    raise ValueError(
+                        f'File encoding {encoding} not supported'
+                    )
+                return encoding
+        return 'ascii'
+
     def _parse_directory_sequence(self, directory_seq):
-        directory_data = directory_seq.get(oclass=emmo.Directory)
+        directory_data = self._get(directory_seq, oclass=emmo.Directory)
         if directory_data:
-            folder = directory_seq.get(rel=emmo.hasSpatialFirst)
+            folder = self._get(directory_seq, rel=emmo.hasSpatialFirst)
             if folder:
                 directory = list()
                 while True:
-                    folder_name = folder[0].get(oclass=emmo.String)
+                    folder_name = self._get(folder[0], oclass=emmo.String)
                     if folder_name:
                         directory.append(
                             folder_name[0].hasSymbolData
@@ -263,7 +544,9 @@ class GMSHSession(WrapperSession):
                     if len(directory) == len(directory_data):
                         return os.path.join(*directory)
                     else:
-                        folder = folder[0].get(rel=emmo.hasSpatialNext)
+                        folder = self._get(
+                            folder[0], rel=emmo.hasSpatialNext
+                        )
                         if not folder:
                             raise ValueError(
                                 'Next element in sequence not found'
@@ -278,31 +561,21 @@ class GMSHSession(WrapperSession):
             )
 
     def _to_meters(self, quantity):
-        return float(
-            np.product(
-                (
-                    Decimal(
-                        self._get_real_value(quantity)
-                    ),
-                    Decimal(
-                        self._get_conversion(quantity)
-                    )
-                )
-            )
-        )
+        return to_meters([quantity], index=self._index)[0]
 
     def _get_vector_data(self, position_vector):
-        vector_data = position_vector.get(oclass=emmo.Length)
+        vector_data = self._get(position_vector, oclass=emmo.Length)
         if vector_data:
-            element = position_vector.get(rel=emmo.hasSpatialFirst)
+            element = self._get(position_vector, rel=emmo.hasSpatialFirst)
             if element:
                 vector = list()
                 while True:
-                    vector.append(self._to_meters(element[0]))
+                    vector.append(element[0])
                     if len(vector) == len(vector_data):
-                        return vector
+                        return to_meters(vector, index=self._index)
                     else:
-                        element = element[0].get(
+                        element = self._get(
+                            element[0],
                             rel=emmo.hasSpatialNext
                         )
                         if not element:
@@ -318,15 +591,8 @@ class GMSHSession(WrapperSession):
                 'Array has no elements of type `emmo.Length`'
             )
 
-    def _get_conversion(self, quantity):
-        return str(
-            CONVERSIONS[
-                self._get_si_unit(quantity)
-            ]
-        )
-
     def _get_real_value(self, physical_property):
-        real = physical_property.get(oclass=emmo.Real)
+        real = self._get(physical_property, oclass=emmo.Real)
         if real:
             return real[0].hasNumericalData
         else:
@@ -335,51 +601,33 @@ class GMSHSession(WrapperSession):
             )
 
     def _get_si_unit(self, entity):
-        prefix = entity.get(oclass=emmo.SIMetricPrefix)
-        unit_entity = entity.get(oclass=emmo.SIUnit)
-        if prefix:
-            if prefix[0].is_a(emmo.Milli):
-                unit = 'm'
-            elif prefix[0].is_a(emmo.Centi):
-                unit = 'c'
-            else:
-                raise ValueError(
-                    'Only Milli- and Centi-prefix currently supported'
-                )
-        else:
-            unit = str()
-        if unit_entity:
-            if unit_entity[0].is_a(emmo.Metre) \
-                    or unit_entity[0].is_a(
-                        emmo.MeterPerUnitOne
-                    ):
-                unit += 'm'
-            elif unit_entity[0].is_a(emmo.SquareMetre):
-                unit += 'm^2'
-            elif unit_entity[0].is_a(emmo.CubicMetre):
-                unit += 'm^3'
-            else:
-                raise ValueError(
-                    'SI-Unit of length must be metric'
-                )
-        else:
-            raise ValueError(
-                'Length has no SI-Unit'
-            )
-        return unit
+        return si_unit(entity, index=self._index)
 
     def _syntactic_extent(self, entity):
+        keys = [
+            (axis, direction)
+            for axis in MAPPING.keys() for direction in MAPPING[axis].keys()
+        ]
+        values = to_meters([
+            self._get(entity, rel=MAPPING[axis][direction])[0]
+            for axis, direction in keys
+        ], index=self._index)
         extent_data = extent()
-        for axis in MAPPING.keys():
-            for direction in MAPPING[axis].keys():
-                extent_data[axis][direction] = self._to_meters(
-                    entity.get(rel=MAPPING[axis][direction])[0]
-                )
+        for (axis, direction), value in zip(keys, values):
+            extent_data[axis][direction] = value
         return extent_data
 
     # OVERRIDE
     def close(self):
-        pass
+        if self._executor is not None:
+            for future in list(self._futures):
+                future.cancel()
+            self._futures.clear()
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        # index of the computation which is currently parsed
+        self._index = None
+        self._context.finalize()
 
     # OVERRIDE
     def _store(self, cuds_object):
@@ -0,0 +1,509 @@
+from collections import OrderedDict, namedtuple
+import os
+import re
+import threading
+import numpy as np
+
+
+VERTEX = re.compile(rb"vertex\s+(\S+\s+\S+\s+\S+)")
+
+# layout of a facet record in a binary .stl after the 80 byte header
+# and the 4 byte facet count
+STL_HEADER = 84
+STL_DTYPE = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attribute", "<u2")
+])
+
+# approximate number of bytes per facet in an ASCII .stl
+ASCII_FACET_BYTES = 256
+
+FacetStatistics = namedtuple(
+    "FacetStatistics",
+    ["volume", "cutoff_volumes", "min_extent", "max_extent"]
+)
+
+
+def is_binary_stl(source_path):
+    """
+    Checks whether the .stl-file is binary-encoded. The file size of a
+    binary .stl is exactly determined by the facet count in its header,
+    while the leading `solid` of ASCII-files is not reliable, since many
+    CAD-exporters also write it into the header of binary files.
+    """
+    size = os.path.getsize(source_path)
+    if size < STL_HEADER:
+        return False
+    with open(source_path, "rb") as source:
+        source.seek(80)
+        count = int(np.frombuffer(source.read(4), dtype="<u4")[0])
+    return size == STL_HEADER + count * STL_DTYPE.itemsize
+
+
+def read_binary_stl(source_path):
+    """
+    Memory-maps all facet records of a binary .stl-file.
+
+    Parameters
+    ----------
+    source_path : str
+        path to the binary .stl-file.
+
+    Returns
+    -------
+    numpy.ndarray
+        read-only view on the facet vertices with shape (N, 3, 3)
+        in single precision, without copying the file into memory.
+    """
+    count = (os.path.getsize(source_path) - STL_HEADER) // STL_DTYPE.itemsize
+    if not count:
+        return np.zeros((0, 3, 3), dtype="<f4")
+    records = np.memmap(
+        source_path, dtype=STL_DTYPE, mode="r",
+        offset=STL_HEADER, shape=(count,)
+    )
+    return records["vertices"]
+
+
+def read_stl(source_path):
+    """
+    Reads the facets of an .stl-file and detects automatically,
+    whether it is ASCII- or binary-encoded.
+    """
+    if is_binary_stl(source_path):
+        return read_binary_stl(source_path)
+    return read_ascii_stl(source_path)
+
+
+def read_ascii_stl(source_path):
+    """
+    Reads all triangular facets of an ASCII .stl-file into one array.
+
+    Parameters
+    ----------
+    source_path : str
+        path to the ASCII .stl-file.
+
+    Returns
+    -------
+    numpy.ndarray
+        facet vertices with shape (N, 3, 3), whereas N is the
+        number of facets, followed by the three vertices of each
+        facet and their xyz-coordinates.
+    """
+    with open(source_path, "rb") as source:
+        coords = _parse_vertices(source.read())
+    if coords.size % 9:
+        raise ValueError(
+            f'Vertices in {source_path} do not describe triangular facets'
+        )
+    return coords.reshape(-1, 3, 3)
+
+
+def iter_stl(source_path, block_size=2**20):
+    """
+    Reads the facets of an ASCII- or binary-encoded .stl-file in blocks
+    of `block_size` facets, so that the peak memory is determined by the
+    block size and not by the file size.
+
+    Parameters
+    ----------
+    source_path : str
+        path to the .stl-file.
+    block_size : int
+        maximum number of facets per block.
+
+    Yields
+    ------
+    numpy.ndarray
+        facet vertices with shape (n, 3, 3) whereas n <= `block_size`.
+    """
+    if is_binary_stl(source_path):
+        with open(source_path, "rb") as source:
+            source.seek(STL_HEADER)
+            while True:
+                records = np.fromfile(
+                    source, dtype=STL_DTYPE, count=block_size
+                )
+                if not len(records):
+                    break
+                yield records["vertices"]
+    else:
+        values = block_size * 9
+        pending = np.zeros(0)
+        tail = b""
+        with open(source_path, "rb") as source:
+            while True:
+                chunk = source.read(block_size * ASCII_FACET_BYTES)
+                data = tail + chunk
+                if chunk:
+                    cut = data.rfind(b"\n") + 1
+                    data, tail = data[:cut], data[cut:]
+                coords = np.concatenate([pending, _parse_vertices(data)])
+                complete = coords.size - coords.size % values
+                for start in range(0, complete, values):
+                    yield coords[start:start + values].reshape(-1, 3, 3)
+                pending = coords[complete:]
+                if not chunk:
+                    break
+        if pending.size % 9:
+            raise ValueError(
+                f'Vertices in {source_path} do not describe triangular facets'
+            )
+        if pending.size:
+            yield pending.reshape(-1, 3, 3)
+
+
+def _parse_vertices(data):
+    coords = b" ".join(VERTEX.findall(data))
+    return np.fromstring(coords.decode(), sep=" ")
+
+
+def signed_volumes(facets):
+    """
+    Calculates the signed volumes of the tetrahedra spanned by the
+    origin and each triangular facet, which is the determinant
+    of the three vertices divided by 6 (triple product).
+
+    Parameters
+    ----------
+    facets : numpy.ndarray
+        facet vertices with shape (N, 3, 3).
+
+    Returns
+    -------
+    numpy.ndarray
+        signed volume of each tetrahedron with shape (N,).
+    """
+    first = np.asarray(facets[:, 0], dtype=float)
+    second = np.asarray(facets[:, 1], dtype=float)
+    third = np.asarray(facets[:, 2], dtype=float)
+    return np.einsum(
+        "ij,ij->i", first, np.cross(second, third)
+    ) / 6
+
+
+def facet_volume(facets, cutoff_level=np.inf):
+    """
+    Sums up the signed volumes of all facets whose vertices are
+    located underneath or on the `cutoff_level` (z-value).
+    Please see `ComplexMesh._calc_volume` for further information.
+
+    Parameters
+    ----------
+    facets : numpy.ndarray
+        facet vertices with shape (N, 3, 3).
+    cutoff_level : float
+        z-value-threshold for the facets to be regarded.
+
+    Returns
+    -------
+    float
+        signed sum of the volumes of all regarded facets.
+    """
+    below = np.all(facets[:, :, 2] <= cutoff_level, axis=1)
+    return float(np.sum(signed_volumes(facets[below])))
+
+
+def facet_statistics(blocks, cutoff_levels=()):
+    """
+    Accumulates the signed volume, the signed volumes underneath
+    each of the `cutoff_levels` (see `facet_volume`) and the
+    bounding box of all facets in one pass over the blocks.
+
+    Parameters
+    ----------
+    blocks : iterable of numpy.ndarray
+        facet vertices with shape (n, 3, 3) per block,
+        e.g. from `iter_stl`.
+    cutoff_levels : sequence of float
+        z-value-thresholds for the cutoff volumes.
+
+    Returns
+    -------
+    FacetStatistics
+        named tuple of the volume, the cutoff volumes
+        and the minimum and maximum extent in xyz.
+    """
+    cutoff_levels = np.asarray(cutoff_levels, dtype=float)
+    volume = 0.
+    cutoff_volumes = np.zeros(cutoff_levels.shape)
+    min_extent = np.full(3, np.inf)
+    max_extent = np.full(3, -np.inf)
+    for facets in blocks:
+        if not len(facets):
+            continue
+        volumes = signed_volumes(facets)
+        volume += np.sum(volumes)
+        top = facets[:, :, 2].max(axis=1)
+        for n, cutoff_level in enumerate(cutoff_levels):
+            cutoff_volumes[n] += np.sum(volumes[top <= cutoff_level])
+        min_extent = np.minimum(min_extent, facets.min(axis=(0, 1)))
+        max_extent = np.maximum(max_extent, facets.max(axis=(0, 1)))
+    return FacetStatistics(
+        float(volume), cutoff_volumes,
+        min_extent.astype(float).tolist(), max_extent.astype(float).tolist()
+    )
+
+
+class GeometryCache:
+
+    """
+    Process-wide least-recently-used cache of parsed facet arrays, which
+    are identified by the absolute path, size and modification time of
+    their source file. Entries are evicted as soon as the total size of
+    the cached arrays exceeds `max_bytes`.
+
+    Memory-mapped arrays of binary files are accounted with their full
+    size, although their pages are only loaded by the operating system
+    on access.
+    """
+
+    def __init__(self, max_bytes=2**30):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        with self._lock:
+            self._max_bytes = value
+            self._evict()
+
+    def get(self, source_path, loader=read_stl):
+        """
+        Returns the facets of the file under `source_path` and parses it
+        via `loader` only if it is not cached yet or has been modified
+        since. The returned arrays are read-only, since they are shared.
+        """
+        key = self._key(source_path)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        facets = loader(source_path)
+        facets.setflags(write=False)
+        with self._lock:
+            for cached_key in list(self._entries):
+                if cached_key[0] == key[0]:
+                    self._remove(cached_key)
+            if facets.nbytes <= self._max_bytes:
+                self._entries[key] = facets
+                self.nbytes += facets.nbytes
+                self._evict()
+        return facets
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _key(self, source_path):
+        stat = os.stat(source_path)
+        return (
+            os.path.abspath(source_path), stat.st_size, stat.st_mtime_ns
+        )
+
+    def _remove(self, key):
+        self.nbytes -= self._entries.pop(key).nbytes
+
+    def _evict(self):
+        while self._entries and self.nbytes > self._max_bytes:
+            self._remove(next(iter(self._entries)))
+
+
+GEOMETRY_CACHE = GeometryCache()
+
+
+def load_stl(source_path):
+    """Reads the facets of an .stl-file through the `GEOMETRY_CACHE`"""
+    return GEOMETRY_CACHE.get(source_path)
+
+
+class VolumeProfile:
+
+    """
+    Cumulative volume V(z) of a closed, triangulated surface underneath
+    a horizontal plane at the height z.
+
+    The cross-sectional area A(z) of the body is the sum of the (signed)
+    shoelace-terms of the segments, in which the plane intersects the
+    facets. Since the end points of these segments move linearly with z,
+    the contribution of each facet is quadratic in z between the heights
+    of its vertices. Collecting these polynomials at all vertex heights
+    in one vectorized pass delivers A(z) piecewise, whose exact integral
+    is V(z). Triangles crossing a level are therefore clipped correctly,
+    in contrast to the neglection of facets in `ComplexMesh._calc_volume`.
+
+    Evaluating V(z) or its inverse is a binary search over the
+    vertex heights afterwards.
+
+    Parameters
+    ----------
+    facets : numpy.ndarray
+        facet vertices with shape (N, 3, 3) of a closed surface.
+    """
+
+    def __init__(self, facets):
+        facets = np.asarray(facets, dtype=float)
+        self.reference = float(facets[:, :, 2].min()) if len(facets) else 0.
+        # the cross-section is invariant to horizontal translations,
+        # which are only applied for the sake of numerical accuracy
+        shift = np.append(facets[:, :, :2].mean(axis=(0, 1)), self.reference)
+        facets = facets - shift
+        normals = np.cross(
+            facets[:, 1] - facets[:, 0], facets[:, 2] - facets[:, 0]
+        )
+        order = np.argsort(facets[:, :, 2], axis=1)
+        vertices = np.take_along_axis(facets, order[:, :, None], axis=1)
+        low, mid, high = vertices[:, 0], vertices[:, 1], vertices[:, 2]
+
+        # the counter-clockwise tangent of the cross-section seen from
+        # above is the cross product of e_z and the outward facet normal
+        # (horizontal facets do not contribute and are neglected below)
+        tangent = np.stack([-normals[:, 1], normals[:, 0]], axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            long_edge = _edge(low, high)
+            sign = np.sign(np.einsum(
+                "ij,ij->i", tangent,
+                mid[:, :2] - _evaluate(long_edge, mid[:, 2])
+            ))
+
+        starts, ends, coefficients = list(), list(), list()
+        for first, second in [(low, mid), (mid, high)]:
+            valid = second[:, 2] > first[:, 2]
+            coefficients.append(
+                _shoelace(
+                    [array[valid] for array in long_edge],
+                    _edge(first[valid], second[valid])
+                ) * 0.5 * sign[valid, None]
+            )
+            starts.append(first[valid, 2])
+            ends.append(second[valid, 2])
+        starts, ends = np.concatenate(starts), np.concatenate(ends)
+        coefficients = np.concatenate(coefficients)
+
+        self.levels, inverse = np.unique(
+            np.concatenate([starts, ends]), return_inverse=True
+        )
+        events = np.concatenate([coefficients, -coefficients])
+        self.coefficients = np.cumsum(
+            np.stack([
+                np.bincount(inverse, events[:, n], len(self.levels))
+                for n in range(3)
+            ], axis=1),
+            axis=0
+        )
+        self.volumes = np.concatenate([[0.], np.cumsum(
+            _integrate(
+                self.coefficients[:-1], self.levels[:-1],
+                np.diff(self.levels)
+            )
+        )])
+        if self.volumes.size and self.volumes[-1] < 0:
+            self.volumes = -self.volumes
+            self.coefficients = -self.coefficients
+
+    @property
+    def total_volume(self):
+        return float(self.volumes[-1]) if self.volumes.size else 0.
+
+    def volume_below(self, level):
+        """
+        Returns the volume of the body underneath one or more absolute
+        heights `level` in L^3, whereas L is the length unit of the facets.
+        """
+        height = np.asarray(level, dtype=float) - self.reference
+        if not self.levels.size:
+            return _like(level, np.zeros_like(height))
+        index = np.clip(
+            np.searchsorted(self.levels, height, side="right") - 1,
+            0, len(self.levels) - 1
+        )
+        width = np.clip(height, self.levels[0], self.levels[-1]) \
+            - self.levels[index]
+        volume = self.volumes[index] + _integrate(
+            self.coefficients[index], self.levels[index], width
+        )
+        return _like(level, volume)
+
+    def height_for_volume_fraction(self, fraction, iterations=64):
+        """
+        Returns the lowest absolute height(s), underneath which the
+        given relative `fraction` (between 0 and 1) of the total volume
+        is located. The height within an interval between two vertex
+        heights is found by bisection of the cubic V(z).
+        """
+        fraction = np.asarray(fraction, dtype=float)
+        if np.any((fraction < 0) | (fraction > 1)):
+            raise ValueError('Volume fraction must be between 0 and 1')
+        if len(self.levels) < 2:
+            return _like(fraction, np.full(fraction.shape, self.reference))
+        target = fraction * self.total_volume
+        index = np.clip(
+            np.searchsorted(self.volumes, target, side="left") - 1,
+            0, len(self.levels) - 2
+        )
+        lower = np.zeros(target.shape)
+        upper = self.levels[index + 1] - self.levels[index]
+        remainder = target - self.volumes[index]
+        for _ in range(iterations):
+            width = (lower + upper) / 2
+            below = _integrate(
+                self.coefficients[index], self.levels[index], width
+            ) < remainder
+            lower = np.where(below, width, lower)
+            upper = np.where(below, upper, width)
+        return _like(fraction, self.levels[index] + upper + self.reference)
+
+
+def _edge(first, second):
+    """Intercepts and slopes of the xy-coordinates along an edge over z"""
+    slope = (second[:, :2] - first[:, :2]) \
+        / (second[:, 2] - first[:, 2])[:, None]
+    return first[:, :2] - slope * first[:, 2, None], slope
+
+
+def _evaluate(edge, level):
+    intercept, slope = edge
+    return intercept + slope * level[:, None]
+
+
+def _shoelace(first, second):
+    """Polynomial coefficients of x1*y2 - x2*y1 over z for two edges"""
+    (p, q), (r, s) = first, second
+    return np.stack([
+        p[:, 0] * r[:, 1] - r[:, 0] * p[:, 1],
+        p[:, 0] * s[:, 1] + q[:, 0] * r[:, 1]
+        - r[:, 0] * q[:, 1] - s[:, 0] * p[:, 1],
+        q[:, 0] * s[:, 1] - s[:, 0] * q[:, 1]
+    ], axis=1)
+
+
+def _integrate(coefficients, start, width):
+    """Integral of c0 + c1*z + c2*z^2 from `start` to `start + width`"""
+    c0, c1, c2 = coefficients[..., 0], coefficients[..., 1], \
+        coefficients[..., 2]
+    return width * (
+        c0 + c1 * (start + width / 2)
+        + c2 * (start**2 + start * width + width**2 / 3)
+    )
+
+
+def _like(value, result):
+    return float(result) if np.ndim(value) == 0 else result
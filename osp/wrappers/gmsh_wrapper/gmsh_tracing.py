@@ -0,0 +1,150 @@
+"""
+Instrumentation of the phases of meshing (e.g. parsing the CUDS-input,
+gmsh-initialization, `generate` and `gmsh.write`) by tracing spans.
+
+Tracing is disabled unless a callback is registered, e.g. the exporter
+of Chrome trace-events:
+
+    exporter = ChromeTraceExporter()
+    add_callback(exporter)
+    session.run()
+    exporter.write('trace.json')
+
+whereas the trace can be viewed in `chrome://tracing` or Perfetto.
+Only the spans of the current process are traced, i.e. not of the
+worker processes of batch- or asynchronous runs.
+"""
+from collections import namedtuple
+import json
+import os
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # e.g. on Windows
+    resource = None
+
+
+Span = namedtuple(
+    "Span", ["name", "start", "wall_time", "cpu_time", "peak_rss_delta",
+             "pid", "thread", "args"]
+)
+Span.__doc__ = """
+Traced phase with its `start` (seconds since the epoch), `wall_time`
+and `cpu_time` (in seconds) and the growth of the peak resident set
+size of the process (`peak_rss_delta` in bytes).
+"""
+
+_CALLBACKS = list()
+
+
+def add_callback(callback):
+    """Registers a callable, which receives each finished `Span`"""
+    _CALLBACKS.append(callback)
+
+
+def remove_callback(callback):
+    """Unregisters a callback, whereas tracing stops without callbacks"""
+    _CALLBACKS.remove(callback)
+
+
+def span(name, **args):
+    """
+    Returns a context manager, which traces the enclosed phase if any
+    callback is registered and does nothing otherwise.
+
+    Parameters
+    ----------
+    name : str
+        name of the phase, e.g. 'generate'.
+    args : dict
+        additional information of the span, e.g. the file name.
+    """
+    if not _CALLBACKS:
+        return _DISABLED
+    return _Tracer(name, args)
+
+
+class _Tracer:
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self._rss = _peak_rss()
+        self._start = time.time()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        finished = Span(
+            name=self.name,
+            start=self._start,
+            wall_time=time.perf_counter() - self._wall,
+            cpu_time=time.process_time() - self._cpu,
+            peak_rss_delta=_peak_rss() - self._rss,
+            pid=os.getpid(),
+            thread=threading.get_ident(),
+            args=self.args
+        )
+        for callback in list(_CALLBACKS):
+            callback(finished)
+
+
+class _Disabled:
+
+    """No-op context manager of spans while tracing is disabled"""
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_DISABLED = _Disabled()
+
+
+def _peak_rss():
+    if resource is None:
+        return 0
+    # in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class ChromeTraceExporter:
+
+    """
+    Callback which collects spans as complete events of the Chrome
+    trace-event format and writes them into a .json-file.
+    """
+
+    def __init__(self):
+        self.events = list()
+        self._lock = threading.Lock()
+
+    def __call__(self, finished):
+        event = {
+            "name": finished.name,
+            "ph": "X",
+            "ts": finished.start * 1e6,
+            "dur": finished.wall_time * 1e6,
+            "pid": finished.pid,
+            "tid": finished.thread,
+            "args": {
+                "cpu_time": finished.cpu_time,
+                "peak_rss_delta": finished.peak_rss_delta,
+                **finished.args
+            }
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def write(self, target_file):
+        with self._lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        with open(target_file, "w") as file:
+            json.dump({"traceEvents": events}, file, default=str)
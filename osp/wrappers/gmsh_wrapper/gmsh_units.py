@@ -0,0 +1,122 @@
+"""
+Conversion of CUDS-quantities into SI-units. The unit and conversion
+factor of each combination of prefix- and unit-class are resolved only
+once and cached, so that converting a quantity only takes one walk over
+its neighbours. The conversion is exact for the supported units, since
+the factors are multiplied as `Decimal`.
+"""
+from decimal import Decimal
+from functools import lru_cache
+
+from osp.core.namespaces import emmo
+
+from osp.wrappers.gmsh_wrapper.gmsh_engine import CONVERSIONS
+
+
+PREFIXES = [
+    (emmo.Milli, 'm'),
+    (emmo.Centi, 'c')
+]
+UNITS = [
+    (emmo.Metre, 'm'),
+    (emmo.MeterPerUnitOne, 'm'),
+    (emmo.SquareMetre, 'm^2'),
+    (emmo.CubicMetre, 'm^3')
+]
+
+
+def to_meters(quantities, index=None):
+    """
+    Converts the values of several quantities (e.g. of a vector) into
+    SI-units.
+
+    Parameters
+    ----------
+    quantities : list of Cuds
+        quantities with a `Real`, an `SIUnit` and an optional prefix.
+    index : CudsIndex
+        index of the quantities, otherwise their neighbours are queried.
+
+    Returns
+    -------
+    list of float
+        values of the quantities in SI-units.
+    """
+    values = list()
+    for quantity in quantities:
+        real, prefix_class, unit_class = _classify(quantity, index)
+        values.append(float(
+            Decimal(real.hasNumericalData)
+            * conversion_factor(prefix_class, unit_class)
+        ))
+    return values
+
+
+def si_unit(quantity, index=None):
+    """Returns the unit of a quantity as in `CONVERSIONS` (e.g. 'mm')"""
+    _, prefix_class, unit_class = _classify(quantity, index, real=False)
+    return unit_name(prefix_class, unit_class)
+
+
+@lru_cache(maxsize=None)
+def conversion_factor(prefix_class, unit_class):
+    """Returns the factor of a prefix- and unit-class into SI-units"""
+    return Decimal(str(CONVERSIONS[unit_name(prefix_class, unit_class)]))
+
+
+@lru_cache(maxsize=None)
+def unit_name(prefix_class, unit_class):
+    """Returns the unit of a prefix- and unit-class (e.g. 'mm')"""
+    if prefix_class is None:
+        prefix = str()
+    else:
+        prefix = _match(prefix_class, PREFIXES)
+        if prefix is None:
+            raise ValueError(
+                'Only Milli- and Centi-prefix currently supported'
+            )
+    if unit_class is None:
+        raise ValueError('Length has no SI-Unit')
+    unit = _match(unit_class, UNITS)
+    if unit is None:
+        raise ValueError('SI-Unit of length must be metric')
+    return prefix + unit
+
+
+def _match(oclass, names):
+    for superclass, name in names:
+        if oclass.is_subclass_of(superclass):
+            return name
+
+
+@lru_cache(maxsize=None)
+def _role(oclass):
+    for role, superclass in [
+        ('real', emmo.Real),
+        ('prefix', emmo.SIMetricPrefix),
+        ('unit', emmo.SIUnit)
+    ]:
+        if oclass.is_subclass_of(superclass):
+            return role
+
+
+def _classify(quantity, index=None, real=True):
+    """Finds the value, prefix- and unit-class in one walk"""
+    neighbours = dict()
+    if index is None:
+        candidates = quantity.get()
+    else:
+        candidates = index.get(quantity)
+    for neighbour in candidates:
+        role = _role(neighbour.oclass)
+        if role and role not in neighbours:
+            neighbours[role] = neighbour
+    if real and 'real' not in neighbours:
+        raise ValueError(f'Real value not found in {quantity.oclass}')
+    prefix = neighbours.get('prefix')
+    unit = neighbours.get('unit')
+    return (
+        neighbours.get('real'),
+        prefix.oclass if prefix else None,
+        unit.oclass if unit else None
+    )
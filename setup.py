@@ -41,6 +41,11 @@ setup(
     cmdclass={
         'install': _install
     },
+    entry_points={
+        'console_scripts': [
+            'gmsh-batch = osp.wrappers.gmsh_wrapper.gmsh_batch:main'
+        ]
+    },
     include_package_data=True,
     packages=find_packages()
 )
@@ -0,0 +1,88 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+
+from osp.wrappers.gmsh_wrapper.gmsh_batch import run_batch, read_specs
+from osp.wrappers.gmsh_wrapper.gmsh_stl import read_stl
+
+path = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestBatch(TestCase):
+
+    def test_run_batch(self):
+        with TemporaryDirectory() as temp_dir:
+            specs = [
+                {
+                    'geometry': 'rectangle',
+                    'target_path': os.path.join(temp_dir, 'rectangle'),
+                    'x_length': 0.02,
+                    'y_length': 0.01,
+                    'z_length': 0.15,
+                    'resolution': 0.001,
+                    'units': 'm'
+                },
+                {
+                    'geometry': 'sphere',
+                    'target_path': os.path.join(temp_dir, 'sphere')
+                },
+                {
+                    'geometry': 'cylinder',
+                    'target_path': os.path.join(temp_dir, 'cylinder'),
+                    'xy_radius': 0.05,
+                    'z_length': 0.2,
+                    'resolution': 0.0014,
+                    'units': 'm'
+                }
+            ]
+            calls = list()
+            results = run_batch(
+                specs, processes=2,
+                progress=lambda *args: calls.append(args)
+            )
+            self.assertEqual(
+                [result['index'] for result in results], [0, 1, 2]
+            )
+            self.assertEqual([call[0] for call in calls], [1, 2, 3])
+            self.assertIsNone(results[0]['error'])
+            self.assertIn('sphere not supported', results[1]['error'])
+            self.assertIsNone(results[2]['error'])
+            self.assertEqual(results[0]['volume'], 3e-5)
+            self.assertListEqual(
+                results[0]['inside_location'], [0.01, 0.005, 0.075]
+            )
+            self.assertListEqual(results[2]['inside_location'], [0, 0, 0.1])
+            for result in [results[0], results[2]]:
+                for output_file in result['output_files']:
+                    self.assertTrue(os.path.exists(output_file))
+            np.testing.assert_allclose(
+                read_stl(results[0]['output_files'][-1]),
+                read_stl(os.path.join(path, 'rectangle_ref.stl')),
+                rtol=0, atol=1e-12
+            )
+
+    def test_read_specs(self):
+        with TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'specs.csv')
+            with open(csv_path, 'w') as file:
+                file.write('geometry,target_path,xy_radius,mesh_dimension\n')
+                file.write('cylinder,out,0.05,2\n')
+                file.write('rectangle,out,,3\n')
+            json_path = os.path.join(temp_dir, 'specs.json')
+            specs = [
+                {
+                    'geometry': 'cylinder', 'target_path': 'out',
+                    'xy_radius': 0.05, 'mesh_dimension': 2
+                },
+                {
+                    'geometry': 'rectangle', 'target_path': 'out',
+                    'mesh_dimension': 3
+                }
+            ]
+            with open(json_path, 'w') as file:
+                json.dump(specs, file)
+            self.assertListEqual(read_specs(csv_path), specs)
+            self.assertListEqual(read_specs(json_path), specs)
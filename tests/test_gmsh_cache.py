@@ -0,0 +1,74 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from osp.wrappers.gmsh_wrapper.gmsh_cache import MeshCache
+
+
+def write(target_path, text):
+    with open(target_path, "w") as file:
+        file.write(text)
+    return target_path
+
+
+class TestMeshCache(TestCase):
+
+    def test_key(self):
+        self.assertEqual(
+            MeshCache.key({'a': 1, 'b': [1, 2]}),
+            MeshCache.key({'b': [1, 2], 'a': 1})
+        )
+        self.assertNotEqual(
+            MeshCache.key({'a': 1}), MeshCache.key({'a': 2})
+        )
+
+    def test_store_and_materialize(self):
+        with TemporaryDirectory() as temp_dir:
+            cache = MeshCache(os.path.join(temp_dir, "cache"))
+            source = os.path.join(temp_dir, "source")
+            target = os.path.join(temp_dir, "target")
+            os.makedirs(source)
+            os.makedirs(target)
+            files = [
+                write(os.path.join(source, "new_surface.stl"), "stl"),
+                write(os.path.join(source, "new_surface.geo"), "geo")
+            ]
+            key = cache.key({'x_length': 1})
+            self.assertIsNone(cache.materialize(key, target))
+            cache.store(key, files)
+            write(os.path.join(target, "new_surface.stl"), "outdated")
+            materialized = cache.materialize(key, target)
+            self.assertListEqual(
+                materialized,
+                [
+                    os.path.join(target, "new_surface.geo"),
+                    os.path.join(target, "new_surface.stl")
+                ]
+            )
+            with open(materialized[1]) as file:
+                self.assertEqual(file.read(), "stl")
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertListEqual(
+                sorted(os.listdir(target)),
+                ["new_surface.geo", "new_surface.stl"]
+            )
+
+    def test_evict(self):
+        with TemporaryDirectory() as temp_dir:
+            cache = MeshCache(os.path.join(temp_dir, "cache"))
+            keys = list()
+            for n in range(3):
+                key = cache.key({'n': n})
+                file = write(os.path.join(temp_dir, f"{n}.stl"), "mesh")
+                cache.store(key, [file])
+                keys.append(key)
+            # the first entry is the most recently used one
+            for key, used in zip(keys, [300, 100, 200]):
+                os.utime(os.path.join(cache.directory, key), (used, used))
+            cache.max_bytes = 8
+            cache.evict()
+            cached = [
+                key for key in keys
+                if os.path.isdir(os.path.join(cache.directory, key))
+            ]
+            self.assertListEqual(cached, [keys[0], keys[2]])
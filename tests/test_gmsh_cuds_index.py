@@ -0,0 +1,48 @@
+from unittest import TestCase
+
+from osp.core.namespaces import emmo
+
+from osp.wrappers.gmsh_wrapper.gmsh_cuds_index import CudsIndex
+
+
+class TestCudsIndex(TestCase):
+
+    def setUp(self):
+        self.vector = emmo.InsidePosition()
+        self.lengths = [emmo.Length() for _ in range(3)]
+        for length, value in zip(self.lengths, [1, 2, 3]):
+            length.add(
+                emmo.Real(hasNumericalData=value), rel=emmo.hasQuantityValue
+            )
+        self.lengths[0].add(self.lengths[1], rel=emmo.hasSpatialNext)
+        self.lengths[1].add(self.lengths[2], rel=emmo.hasSpatialNext)
+        self.vector.add(self.lengths[0], rel=emmo.hasSpatialFirst)
+        self.vector.add(self.lengths[1], rel=emmo.hasSpatialDirectPart)
+        self.vector.add(self.lengths[2], rel=emmo.hasSpatialLast)
+
+    def test_get(self):
+        index = CudsIndex(self.vector)
+        self.assertEqual(7, len(index))
+        self.assertIn(self.lengths[2], index)
+        for kwargs in [
+            {},
+            {'oclass': emmo.Length},
+            {'rel': emmo.hasSpatialFirst},
+            {'rel': emmo.hasSpatialNext, 'oclass': emmo.Length}
+        ]:
+            self.assertSetEqual(
+                {entity.uid for entity in index.get(self.vector, **kwargs)},
+                {entity.uid for entity in self.vector.get(**kwargs)}
+            )
+        self.assertEqual(
+            self.lengths[2].uid,
+            index.get(self.lengths[1], rel=emmo.hasSpatialNext)[0].uid
+        )
+
+    def test_entities(self):
+        index = CudsIndex(self.vector)
+        self.assertSetEqual(
+            {entity.uid for entity in index.entities(emmo.Length)},
+            {entity.uid for entity in self.lengths}
+        )
+        self.assertEqual(3, len(index.entities(emmo.Real)))
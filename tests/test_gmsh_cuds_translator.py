@@ -0,0 +1,81 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+from osp.core.namespaces import emmo
+from osp.wrappers.cuds_translator import CudsTranslator
+from osp.wrappers.gmsh_wrapper.gmsh_cuds_translator import Rectangle
+
+
+class TestTranslator(TestCase):
+
+    def test_query_cache(self):
+        with TemporaryDirectory() as temp_dir:
+            with mock.patch.object(
+                CudsTranslator, 'get_cuds', autospec=True,
+                side_effect=CudsTranslator.get_cuds
+            ) as get_cuds:
+                first = Rectangle(temp_dir)
+                queries = [call[0][1] for call in get_cuds.call_args_list]
+                self.assertEqual(len(queries), len(set(queries)))
+                # the results of the template are reused
+                second = Rectangle(temp_dir)
+                self.assertEqual(len(queries), get_cuds.call_count)
+            for query in [Rectangle.mesh_data, Rectangle.x_length]:
+                self.assertNotEqual(
+                    first.get_cuds(query)[0][0].uid,
+                    second.get_cuds(query)[0][0].uid
+                )
+
+    def test_from_table(self):
+        with TemporaryDirectory() as temp_dir:
+            rows = [
+                {
+                    'directory': temp_dir,
+                    'values': {
+                        'x': x, 'y': 1, 'z': 1,
+                        'filling_fraction': 1, 'resolution': 1
+                    }
+                }
+                for x in [1, 2]
+            ]
+            with mock.patch.object(
+                CudsTranslator, '__init__', autospec=True,
+                side_effect=CudsTranslator.__init__
+            ) as parse:
+                models = Rectangle.from_table(rows)
+                Rectangle.from_table(rows)
+            self.assertLessEqual(parse.call_count, 1)
+            self.assertNotEqual(
+                models[0].get_model().uid, models[1].get_model().uid
+            )
+            for model, x in zip(models, [1, 2]):
+                x_length, real = model.get_cuds(model.x_length)[0]
+                self.assertEqual(x, real.hasNumericalData)
+                self.assertIn(
+                    x_length.uid,
+                    [
+                        entity.uid for entity in
+                        model.get_model().get(oclass=emmo.GeometryData)[0]
+                        .get(rel=emmo.hasXLength)
+                    ]
+                )
+
+    def test_template_unmodified(self):
+        with TemporaryDirectory() as temp_dir:
+            template = Rectangle._get_template(Rectangle.rdf_file)
+            _, real = template._query(Rectangle.x_length)[0]
+            value = real.hasNumericalData
+            rec = Rectangle(
+                temp_dir,
+                values={
+                    'x': value + 1, 'y': 1, 'z': 1,
+                    'filling_fraction': 1, 'resolution': 1
+                }
+            )
+            self.assertEqual(value, real.hasNumericalData)
+            outside = emmo.Real(hasNumericalData=1)
+            with mock.patch.object(
+                template, '_query', return_value=[(outside,)]
+            ):
+                with self.assertRaises(ValueError):
+                    rec.get_cuds(Rectangle.x_length)
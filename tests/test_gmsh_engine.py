@@ -1,12 +1,20 @@
 import os
+import shutil
 from tempfile import TemporaryDirectory
-from unittest import TestCase
+from unittest import TestCase, mock
 import warnings
 
+import gmsh
 import numpy as np
 
 from osp.wrappers.gmsh_wrapper.gmsh_engine import (
-    RectangularMesh, CylinderMesh, ComplexMesh, extent
+    RectangularMesh, CylinderMesh, ComplexMesh, extent, simplex_qualities,
+    corner_qualities, CORNERS
+)
+from osp.wrappers.gmsh_wrapper.gmsh_context import GMSHContext, LazyModule
+from osp.wrappers.gmsh_wrapper.gmsh_cache import MeshCache
+from osp.wrappers.gmsh_wrapper.gmsh_stl import (
+    is_binary_stl, read_stl, iter_stl, STL_DTYPE
 )
 
 path = os.path.dirname(os.path.abspath(__file__))
@@ -107,7 +115,7 @@ class TestMeshes(TestCase):
                 self.rectangular_volume,
                 self.rectangular.volume
             )
-            self.compare_files(
+            self.compare_meshes(
                 stl_path, self.rectangular_stl_ref
             )
             self.compare_files(
@@ -140,13 +148,213 @@ class TestMeshes(TestCase):
                 self.cylinder.volume,
                 places=1
             )
-            self.compare_files(
+            self.compare_meshes(
                 stl_path, self.cylinder_stl_ref
             )
             self.compare_files(
                 geo_path, self.cylinder_geo_ref
             )
 
+    def test_without_geo(self):
+        with TemporaryDirectory() as temp_dir:
+            self.rectangular.export_geo = False
+            self.rectangular.write_mesh(temp_dir)
+            self.assertListEqual(os.listdir(temp_dir), ['new_surface.stl'])
+            self.compare_meshes(
+                os.path.join(temp_dir, 'new_surface.stl'),
+                self.rectangular_stl_ref
+            )
+
+    def test_surface_mesh(self):
+        with TemporaryDirectory() as temp_dir:
+            self.rectangular.mesh_dimension = 2
+            self.rectangular.write_mesh(temp_dir)
+            self.compare_meshes(
+                os.path.join(temp_dir, 'new_surface.stl'),
+                self.rectangular_stl_ref
+            )
+
+    def test_binary_stl(self):
+        with TemporaryDirectory() as temp_dir:
+            stl_path = os.path.join(temp_dir, 'new_surface.stl')
+            self.rectangular.stl_encoding = 'binary'
+            self.rectangular.write_mesh(temp_dir)
+            self.assertTrue(is_binary_stl(stl_path))
+            self.assertLess(
+                os.path.getsize(stl_path),
+                os.path.getsize(self.rectangular_stl_ref) / 3
+            )
+            np.testing.assert_allclose(
+                read_stl(stl_path),
+                read_stl(self.rectangular_stl_ref),
+                atol=1e-7
+            )
+
+    def test_output_formats(self):
+        with TemporaryDirectory() as temp_dir:
+            self.rectangular.output_formats = ['stl', 'msh', 'vtk']
+            self.rectangular.write_mesh(temp_dir)
+            for mesh_format in ['stl', 'msh', 'vtk']:
+                self.assertIn(
+                    os.path.join(temp_dir, f'new_surface.{mesh_format}'),
+                    self.rectangular.output_files
+                )
+            for mesh_format in ['msh', 'vtk']:
+                complex_mesh = ComplexMesh(
+                    source_path=os.path.join(
+                        temp_dir, f'new_surface.{mesh_format}'
+                    ),
+                    units='m'
+                )
+                complex_mesh.inspect_file()
+                self.assertAlmostEqual(
+                    complex_mesh.volume, self.rectangular.volume
+                )
+
+    def test_inspect_file(self):
+        for mesh in [self.rectangular, self.cylinder]:
+            mesh.inspect_file()
+        self.assertDictEqual(
+            self.rectangular.max_extent, self.rectangular_max_extent
+        )
+        self.assertListEqual(
+            self.cylinder.inside_location, self.cylinder_inside_location
+        )
+
+    def test_lazy_module(self):
+        module = LazyModule('json')
+        self.assertFalse(module.loaded)
+        self.assertEqual(module.dumps([1]), '[1]')
+        self.assertTrue(module.loaded)
+
+    def test_mesh_statistics(self):
+        with TemporaryDirectory() as temp_dir:
+            self.cylinder.write_mesh(temp_dir)
+        statistics = self.cylinder.mesh_statistics
+        self.assertGreater(statistics['nodes'], 0)
+        self.assertGreater(sum(statistics['elements'].values()), 0)
+        quality = statistics['quality']
+        self.assertLessEqual(quality['min'], quality['p5'])
+        self.assertLessEqual(quality['p5'], quality['p50'])
+        self.assertLessEqual(quality['p50'], quality['p95'])
+        self.assertLessEqual(quality['p95'], 1 + 1e-9)
+        self.assertGreater(quality['min'], 0)
+        # the recombined rectangle only consists of cuboids
+        with TemporaryDirectory() as temp_dir:
+            self.rectangular.write_mesh(temp_dir)
+        self.assertAlmostEqual(
+            self.rectangular.mesh_statistics['quality']['min'], 1
+        )
+
+    def test_simplex_qualities(self):
+        triangles = np.array([
+            [[0, 0, 0], [1, 0, 0], [0.5, np.sqrt(3)/2, 0]],
+            [[0, 0, 0], [1, 0, 0], [2, 0, 0]]
+        ])
+        np.testing.assert_allclose(simplex_qualities(triangles), [1, 0])
+        tetrahedra = np.array([
+            [[1, 1, 1], [1, -1, -1], [-1, 1, -1], [-1, -1, 1]],
+            [[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 0]]
+        ])
+        np.testing.assert_allclose(simplex_qualities(tetrahedra), [1, 0])
+
+    def test_corner_qualities(self):
+        cube = np.array([
+            [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+            [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
+        ], dtype=float)
+        sheared = cube.copy()
+        sheared[4:, 0] += 1
+        np.testing.assert_allclose(
+            corner_qualities(np.stack([cube, sheared]), *CORNERS[5]),
+            [1, np.sqrt(0.5)]
+        )
+        np.testing.assert_allclose(
+            corner_qualities(np.stack([cube[:4], 2*cube[:4]]), *CORNERS[3]),
+            [1, 1]
+        )
+        prism = np.array([
+            [0, 0, 0], [1, 0, 0], [0.5, np.sqrt(3)/2, 0],
+            [0, 0, 1], [1, 0, 1], [0.5, np.sqrt(3)/2, 1]
+        ])
+        np.testing.assert_allclose(
+            corner_qualities(prism[None], *CORNERS[6]), [1]
+        )
+
+    def test_cache(self):
+        with TemporaryDirectory() as temp_dir:
+            self.rectangular.cache = MeshCache(
+                os.path.join(temp_dir, 'cache')
+            )
+            for name in ['first', 'second']:
+                target_path = os.path.join(temp_dir, name)
+                os.makedirs(target_path)
+                self.rectangular.write_mesh(target_path)
+                self.compare_meshes(
+                    os.path.join(target_path, 'new_surface.stl'),
+                    self.rectangular_stl_ref
+                )
+                self.compare_files(
+                    os.path.join(target_path, 'new_surface.geo'),
+                    self.rectangular_geo_ref
+                )
+            self.assertEqual(self.rectangular.cache.hits, 1)
+            self.assertDictEqual(
+                self.rectangular.max_extent, self.rectangular_max_extent
+            )
+
+    def test_cache_same_directory(self):
+        with TemporaryDirectory() as temp_dir:
+            cache = MeshCache(os.path.join(temp_dir, 'cache'))
+            target_path = os.path.join(temp_dir, 'target')
+            primed_path = os.path.join(temp_dir, 'primed')
+            for directory in [target_path, primed_path]:
+                os.makedirs(directory)
+            self.rectangular.cache = self.cylinder.cache = cache
+            self.rectangular.write_mesh(primed_path)
+            # A is hardlinked from the cache, B overwrites it, A again
+            for mesh in [self.rectangular, self.cylinder, self.rectangular]:
+                mesh.write_mesh(target_path)
+            self.assertEqual(cache.hits, 2)
+            for directory in [target_path, primed_path]:
+                self.compare_meshes(
+                    os.path.join(directory, 'new_surface.stl'),
+                    self.rectangular_stl_ref
+                )
+                self.compare_files(
+                    os.path.join(directory, 'new_surface.geo'),
+                    self.rectangular_geo_ref
+                )
+
+    def test_context(self):
+        with GMSHContext() as context, TemporaryDirectory() as temp_dir:
+            stl_path = os.path.join(temp_dir, 'new_surface.stl')
+            algorithm = gmsh.option.getNumber("Mesh.Algorithm3D")
+            for mesh in [self.rectangular, self.cylinder, self.rectangular]:
+                mesh.context = context
+                mesh.write_mesh(temp_dir)
+                self.assertTrue(context.initialized)
+                self.assertEqual(
+                    gmsh.option.getNumber("Mesh.Algorithm3D"), algorithm
+                )
+                self.assertEqual(len(gmsh.model.getEntities()), 0)
+            self.compare_meshes(stl_path, self.rectangular_stl_ref)
+        self.assertFalse(context.initialized)
+
+    def test_threads(self):
+        with GMSHContext() as context, TemporaryDirectory() as temp_dir:
+            num_threads = gmsh.option.getNumber("General.NumThreads")
+            self.cylinder.trait_set(
+                context=context, num_threads=2, algorithm_3d='hxt'
+            )
+            self.cylinder.write_mesh(temp_dir)
+            self.assertTrue(
+                os.path.exists(os.path.join(temp_dir, 'new_surface.stl'))
+            )
+            self.assertEqual(
+                gmsh.option.getNumber("General.NumThreads"), num_threads
+            )
+
     def test_complex(self):
         warnings.warn(
                 "The destinction between true and "
@@ -182,6 +390,80 @@ class TestMeshes(TestCase):
             delta=3
         )
 
+    def test_complex_streaming(self):
+        streamed = ComplexMesh(
+            source_path=self.complex.source_path,
+            units="mm",
+            streaming=True,
+            block_size=100
+        )
+        with mock.patch(
+            'osp.wrappers.gmsh_wrapper.gmsh_engine.iter_stl',
+            wraps=iter_stl
+        ) as patched:
+            self.assertAlmostEqual(self.complex.volume, streamed.volume)
+        patched.assert_called_once_with(self.complex.source_path, 100)
+        self.assertAlmostEqual(
+            self.complex_volume,
+            streamed.volume,
+            delta=3
+        )
+
+    def test_complex_geometry_file(self):
+        # the reference meshes itself, the geometry alone has no nodes
+        with open(self.rectangular_geo_ref) as file:
+            geometry = file.read().split('Mesh.Algorithm3D')[0]
+        with TemporaryDirectory() as temp_dir:
+            source_path = os.path.join(temp_dir, 'rectangle.geo')
+            with open(source_path, 'w') as file:
+                file.write(geometry)
+            complex_mesh = ComplexMesh(source_path=source_path, units="m")
+            complex_mesh.inspect_file()
+        for ax in self.rectangular_max_extent.keys():
+            for direction in self.rectangular_max_extent[ax].keys():
+                self.assertAlmostEqual(
+                    complex_mesh.max_extent[ax][direction],
+                    self.rectangular_max_extent[ax][direction]
+                )
+
+    def test_complex_write_mesh(self):
+        with TemporaryDirectory() as temp_dir:
+            source_path = os.path.join(temp_dir, 'new_surface.stl')
+            shutil.copyfile(self.complex.source_path, source_path)
+            complex_mesh = ComplexMesh(source_path=source_path, units="mm")
+            with self.assertRaises(ValueError):
+                complex_mesh.write_mesh(temp_dir)
+            self.assertListEqual(os.listdir(temp_dir), ['new_surface.stl'])
+
+    def test_complex_modified_file(self):
+        with TemporaryDirectory() as temp_dir:
+            source_path = os.path.join(temp_dir, 'cone.stl')
+            shutil.copyfile(self.complex.source_path, source_path)
+            complex_mesh = ComplexMesh(source_path=source_path, units="mm")
+            volume = complex_mesh.volume
+            height = complex_mesh.height_for_volume_fraction(1)
+            # overwrite with the cone scaled by 2 as binary .stl-file
+            records = np.zeros(len(read_stl(source_path)), dtype=STL_DTYPE)
+            records['vertices'] = 2*read_stl(source_path)
+            with open(source_path, 'wb') as file:
+                file.write(bytes(80))
+                file.write(np.uint32(len(records)).tobytes())
+                records.tofile(file)
+            # the binary file is single-precision
+            self.assertAlmostEqual(
+                complex_mesh.volume, 8*volume, delta=1e-3
+            )
+            self.assertAlmostEqual(
+                complex_mesh.height_for_volume_fraction(1), 2*height
+            )
+
+    def compare_meshes(self, target_path, ref_path):
+        # the last digits of the coordinates may differ with the
+        # history of the gmsh-kernel
+        np.testing.assert_allclose(
+            read_stl(target_path), read_stl(ref_path), rtol=0, atol=1e-12
+        )
+
     def compare_files(self, target_path, ref_path):
         with open(target_path, "r") as target, \
                 open(ref_path, "r") as ref:
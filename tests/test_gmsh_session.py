@@ -1,10 +1,12 @@
-from osp.wrappers.gmsh_wrapper.gmsh_session import GMSHSession
+from osp.wrappers.gmsh_wrapper.gmsh_session import GMSHSession, MeshFuture
 from osp.wrappers.gmsh_wrapper.gmsh_engine import extent
+from osp.wrappers.gmsh_wrapper.gmsh_stl import is_binary_stl, read_stl
 from osp.wrappers.gmsh_wrapper.gmsh_cuds_translator import (
     Rectangle, Cylinder, Complex
 )
 from osp.core.namespaces import emmo, cuba
 
+from concurrent.futures import Future
 import numpy as np
 import os
 from tempfile import TemporaryDirectory
@@ -64,7 +66,8 @@ class TestGMSHSession(unittest.TestCase):
             self.assertTrue(os.path.exists(geo_path))
             self.assertTrue(os.path.exists(stl_path))
             self.compare_files(geo_path, geo_ref)
-            self.compare_files(stl_path, stl_ref)
+            self.compare_meshes(stl_path, stl_ref)
+            self.assertEqual(session._geometry.mesh_dimension, 2)
 
             rec_extent = extent(max_extent=[0.02, 0.01, 0.15])
             filling_extent = extent(max_extent=[0.02, 0.01, 0.075])
@@ -82,6 +85,264 @@ class TestGMSHSession(unittest.TestCase):
             self.assertEqual(3e-5, meta_data[2])
             self.assertListEqual([0.01, 0.005, 0.075], meta_data[3])
 
+    def test_binary_rectangle(self):
+        with GMSHSession() as session, TemporaryDirectory() as temp_dir:
+
+            wrapper = cuba.Wrapper(session=session)
+
+            rec = Rectangle(
+                temp_dir,
+                values={
+                    'x': 20,
+                    'y': 10,
+                    'z': 150,
+                    'filling_fraction': 0.5,
+                    'resolution': 1
+                },
+                units={
+                    'lengths': "mm",
+                    'resolution': "mm"
+                },
+                session=session,
+                encoding="binary"
+            )
+
+            wrapper.add(rec.get_model(), rel=emmo.hasPart)
+            wrapper.session.run()
+
+            stl_path = os.path.join(temp_dir, 'new_surface.stl')
+            stl_ref = os.path.join(path, 'rectangle_ref.stl')
+            self.assertTrue(is_binary_stl(stl_path))
+            np.testing.assert_allclose(
+                read_stl(stl_path), read_stl(stl_ref), atol=1e-7
+            )
+
+    def test_msh_rectangle(self):
+        with GMSHSession() as session, TemporaryDirectory() as temp_dir:
+
+            wrapper = cuba.Wrapper(session=session)
+
+            rec = Rectangle(
+                temp_dir,
+                values={
+                    'x': 20,
+                    'y': 10,
+                    'z': 150,
+                    'filling_fraction': 0.5,
+                    'resolution': 1
+                },
+                units={
+                    'lengths': "mm",
+                    'resolution': "mm"
+                },
+                session=session,
+                formats=["stl", "msh"]
+            )
+
+            wrapper.add(rec.get_model(), rel=emmo.hasPart)
+            wrapper.session.run()
+
+            for mesh_format in ['stl', 'msh']:
+                self.assertTrue(os.path.isfile(
+                    os.path.join(temp_dir, f'new_surface.{mesh_format}')
+                ))
+            self.assertEqual(session._geometry.mesh_dimension, 3)
+
+    def test_dry_run(self):
+        with GMSHSession(dry_run=True) as session, \
+                TemporaryDirectory() as temp_dir:
+
+            wrapper = cuba.Wrapper(session=session)
+
+            cyl = Cylinder(
+                temp_dir,
+                values={
+                    'radius': 10,
+                    'length': 150,
+                    'filling_fraction': 0.5,
+                    'resolution': 1
+                },
+                units={
+                    'lengths': "mm",
+                    'resolution': "mm"
+                },
+                session=session
+            )
+
+            wrapper.add(cyl.get_model(), rel=emmo.hasPart)
+            wrapper.session.run()
+            meta_data = cuds_to_meta_data(wrapper)
+
+            self.assertListEqual([], os.listdir(temp_dir))
+            self.assertFalse(session._context.initialized)
+            cyl_extent = extent(
+                min_extent=[-0.01, -0.01, 0],
+                max_extent=[0.01, 0.01, 0.15]
+            )
+            for ax in cyl_extent.keys():
+                for direction in cyl_extent[ax].keys():
+                    self.assertAlmostEqual(
+                        meta_data[0][ax][direction],
+                        cyl_extent[ax][direction]
+                    )
+            self.assertAlmostEqual(
+                np.pi*0.01**2*0.15, meta_data[2]
+            )
+            self.assertListEqual([0, 0, 0.075], meta_data[3])
+
+    def test_multiple_computations(self):
+        with GMSHSession(processes=2) as session, \
+                TemporaryDirectory() as temp_dir:
+
+            wrapper = cuba.Wrapper(session=session)
+
+            models = list()
+            for name, length in [('first', 150), ('second', 100)]:
+                target_path = os.path.join(temp_dir, name)
+                os.makedirs(target_path)
+                models.append(Rectangle(
+                    target_path,
+                    values={
+                        'x': 20,
+                        'y': 10,
+                        'z': length,
+                        'filling_fraction': 0.5,
+                        'resolution': 1
+                    },
+                    units={
+                        'lengths': "mm",
+                        'resolution': "mm"
+                    },
+                    session=session
+                ))
+                wrapper.add(models[-1].get_model(), rel=emmo.hasPart)
+            wrapper.session.run()
+
+            for name in ['first', 'second']:
+                self.assertTrue(os.path.exists(
+                    os.path.join(temp_dir, name, 'new_surface.stl')
+                ))
+            for model, z_length in zip(models, [0.15, 0.1]):
+                geo_data = model.get_cuds(model.geo_data)[0][0]
+                mesh_data = model.get_cuds(model.mesh_data)[0][0]
+                volume = geo_data.get(oclass=emmo.Volume)
+                self.assertAlmostEqual(
+                    0.02*0.01*z_length, session._to_meters(volume[0])
+                )
+                self.assertEqual(
+                    z_length,
+                    session._syntactic_extent(mesh_data)["z"]["max"]
+                )
+
+            # the worker processes are reused by the next run
+            executor = session._executor
+            self.assertIsNotNone(executor)
+            wrapper.session.run()
+            self.assertIs(executor, session._executor)
+
+    def test_shared_target_path(self):
+        with GMSHSession() as session, TemporaryDirectory() as temp_dir:
+
+            wrapper = cuba.Wrapper(session=session)
+            for _ in range(2):
+                rec = Rectangle(temp_dir, session=session)
+                wrapper.add(rec.get_model(), rel=emmo.hasPart)
+            with self.assertRaises(ValueError):
+                wrapper.session.run()
+            with self.assertRaises(ValueError):
+                wrapper.session.run_async()
+            self.assertFalse(os.listdir(temp_dir))
+
+    def test_shared_units(self):
+        with GMSHSession(dry_run=True) as session, \
+                TemporaryDirectory() as temp_dir:
+
+            wrapper = cuba.Wrapper(session=session)
+
+            rec = Rectangle(temp_dir, session=session)
+            wrapper.add(rec.get_model(), rel=emmo.hasPart)
+            wrapper.session.run()
+
+            mesh_data = rec.get_cuds(rec.mesh_data)[0][0]
+            units = {
+                length.get(rel=emmo.hasReferenceUnit)[0].uid
+                for length in mesh_data.get(oclass=emmo.Length)
+            }
+            self.assertEqual(1, len(units))
+            self.assertIn(units.pop(), session._registry)
+
+    def test_run_async(self):
+        with GMSHSession() as session, TemporaryDirectory() as temp_dir:
+
+            wrapper = cuba.Wrapper(session=session)
+
+            rec = Rectangle(
+                temp_dir,
+                values={
+                    'x': 20,
+                    'y': 10,
+                    'z': 150,
+                    'filling_fraction': 0.5,
+                    'resolution': 1
+                },
+                units={
+                    'lengths': "mm",
+                    'resolution': "mm"
+                },
+                session=session
+            )
+
+            wrapper.add(rec.get_model(), rel=emmo.hasPart)
+            future = wrapper.session.run_async()
+            self.assertIn(future.status, ['pending', 'running'])
+            meshes = future.result(timeout=60)
+            self.assertEqual('done', future.status)
+            self.assertFalse(future.cancel())
+
+            meta_data = cuds_to_meta_data(wrapper)
+            self.assertEqual(3e-5, meta_data[2])
+            self.assertListEqual([0.01, 0.005, 0.075], meta_data[3])
+            mesh_data = rec.get_cuds(rec.mesh_data)[0][0]
+            statistics = {
+                sign[0].hasSymbolData:
+                    quantity.get(oclass=emmo.Real)[0].hasNumericalData
+                for quantity in mesh_data.get(oclass=emmo.Quantity)
+                for sign in [quantity.get(oclass=emmo.String)] if sign
+            }
+            self.assertIn('quality/min', statistics)
+            self.assertEqual(
+                meshes[0].mesh_statistics['nodes'], statistics['nodes']
+            )
+            self.assertListEqual(
+                [os.path.join(temp_dir, 'new_surface.stl')],
+                [
+                    output_file for output_file in meshes[0].output_files
+                    if output_file.endswith('.stl')
+                ]
+            )
+
+    def test_finished_jobs(self):
+        job = Future()
+        job.set_result('mesh')
+        results = list()
+        # the jobs may be finished before the future is created
+        future = MeshFuture([job], on_results=results.append)
+        self.assertEqual('done', future.status)
+        self.assertListEqual([['mesh']], results)
+
+    def test_close_async(self):
+        with TemporaryDirectory() as temp_dir, GMSHSession() as session:
+
+            wrapper = cuba.Wrapper(session=session)
+            for name in ['first', 'second']:
+                target_path = os.path.join(temp_dir, name)
+                os.makedirs(target_path)
+                rec = Rectangle(target_path, session=session)
+                wrapper.add(rec.get_model(), rel=emmo.hasPart)
+            future = wrapper.session.run_async()
+        # pending runs are cancelled when the session is closed
+        self.assertIn(future.status, ['cancelled', 'done'])
+
     def test_cylinder(self):
         with GMSHSession() as session, TemporaryDirectory() as temp_dir:
 
@@ -114,7 +375,7 @@ class TestGMSHSession(unittest.TestCase):
             self.assertTrue(os.path.exists(geo_path))
             self.assertTrue(os.path.exists(stl_path))
             self.compare_files(geo_path, geo_ref)
-            self.compare_files(stl_path, stl_ref)
+            self.compare_meshes(stl_path, stl_ref)
 
             cyl_extent = extent([-0.05, -0.05, 0], [0.05, 0.05, 0.2])
             filling_extent = extent([-0.05, -0.05, 0], [0.05, 0.05, 0.1])
@@ -186,6 +447,13 @@ class TestGMSHSession(unittest.TestCase):
 
             # volume_cutoff = 1/3*(0.05*(1-0.01))**2*np.pi*(0.01*0.5)
 
+    def compare_meshes(self, target_path, ref_path):
+        # the last digits of the coordinates may differ with the
+        # history of the gmsh-kernel
+        np.testing.assert_allclose(
+            read_stl(target_path), read_stl(ref_path), rtol=0, atol=1e-12
+        )
+
     def compare_files(self, target_path, ref_path):
         with open(target_path, "r") as target, \
                 open(ref_path, "r") as ref:
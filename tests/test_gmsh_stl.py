@@ -0,0 +1,209 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+
+from osp.wrappers.gmsh_wrapper.gmsh_stl import (
+    read_ascii_stl, read_stl, is_binary_stl, signed_volumes, facet_volume,
+    GeometryCache, VolumeProfile, iter_stl, facet_statistics, STL_DTYPE
+)
+
+path = os.path.dirname(os.path.abspath(__file__))
+
+
+def determinant_volume(source_path, cutoff_level):
+    """Facet-by-facet reference of the sum-of-determinants-approach"""
+    volume = 0
+    points = list()
+    with open(source_path, "r") as source:
+        for line in source:
+            line_split = line.split()
+            if "vertex" in line_split:
+                coords = list(map(float, line_split[-3:]))
+                if coords[-1] <= cutoff_level:
+                    points.append(coords)
+            elif "endloop" in line_split:
+                points = list()
+            if len(points) == 3:
+                volume += np.linalg.det(np.array(points))/6
+    return abs(volume)
+
+
+def write_binary(target_path, facets):
+    records = np.zeros(len(facets), dtype=STL_DTYPE)
+    records["vertices"] = facets
+    with open(target_path, "wb") as file:
+        file.write(b"solid binary".ljust(80, b" "))
+        file.write(np.uint32(len(facets)).tobytes())
+        file.write(records.tobytes())
+
+
+def box(lengths, origin):
+    corners = np.array([
+        [[0, 0, 0], [0, 1, 0], [1, 1, 0]], [[0, 0, 0], [1, 1, 0], [1, 0, 0]],
+        [[0, 0, 1], [1, 0, 1], [1, 1, 1]], [[0, 0, 1], [1, 1, 1], [0, 1, 1]],
+        [[0, 0, 0], [1, 0, 0], [1, 0, 1]], [[0, 0, 0], [1, 0, 1], [0, 0, 1]],
+        [[0, 1, 0], [0, 1, 1], [1, 1, 1]], [[0, 1, 0], [1, 1, 1], [1, 1, 0]],
+        [[0, 0, 0], [0, 0, 1], [0, 1, 1]], [[0, 0, 0], [0, 1, 1], [0, 1, 0]],
+        [[1, 0, 0], [1, 1, 0], [1, 1, 1]], [[1, 0, 0], [1, 1, 1], [1, 0, 1]]
+    ], dtype=float)
+    return corners * lengths + origin
+
+
+class TestSTL(TestCase):
+
+    def setUp(self):
+        self.cone_path = os.path.join(path, "cone.stl")
+        self.cone_volume = 1/3*(np.pi*5**2*10)
+
+    def test_read_ascii_stl(self):
+        facets = read_ascii_stl(self.cone_path)
+        self.assertEqual(facets.shape, (1634, 3, 3))
+        np.testing.assert_allclose(
+            facets[0],
+            [
+                [-1.91534, -0.172383, 3.84615],
+                [-1.53227, 0.137907, 3.07692],
+                [-1.53227, -0.137907, 3.07692]
+            ]
+        )
+
+    def test_signed_volumes(self):
+        facets = np.array([[[1, 0, 0], [0, 1, 0], [0, 0, 1]]])
+        np.testing.assert_allclose(signed_volumes(facets), [1/6])
+        np.testing.assert_allclose(signed_volumes(facets[:, ::-1]), [-1/6])
+
+    def test_facet_volume(self):
+        facets = read_ascii_stl(self.cone_path)
+        self.assertAlmostEqual(
+            abs(facet_volume(facets)), self.cone_volume, delta=3
+        )
+        for cutoff_level in [np.inf, 10, 7.5, 5, 0.5]:
+            self.assertAlmostEqual(
+                abs(facet_volume(facets, cutoff_level)),
+                determinant_volume(self.cone_path, cutoff_level)
+            )
+
+    def test_read_binary_stl(self):
+        facets = read_ascii_stl(self.cone_path)
+        with TemporaryDirectory() as temp_dir:
+            binary_path = os.path.join(temp_dir, "cone.stl")
+            write_binary(binary_path, facets)
+            self.assertTrue(is_binary_stl(binary_path))
+            self.assertFalse(is_binary_stl(self.cone_path))
+            binary_facets = read_stl(binary_path)
+            self.assertIsInstance(binary_facets.base, np.memmap)
+            np.testing.assert_allclose(binary_facets, facets, rtol=1e-6)
+            self.assertAlmostEqual(
+                facet_volume(binary_facets),
+                facet_volume(facets),
+                places=3
+            )
+            del binary_facets
+
+    def test_geometry_cache(self):
+        cache = GeometryCache()
+        facets = cache.get(self.cone_path)
+        self.assertIs(cache.get(self.cone_path), facets)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.nbytes, facets.nbytes)
+        self.assertFalse(facets.flags.writeable)
+        with TemporaryDirectory() as temp_dir:
+            binary_path = os.path.join(temp_dir, "cone.stl")
+            write_binary(binary_path, facets)
+            binary_facets = cache.get(binary_path)
+            self.assertEqual(len(cache), 2)
+            # modified files are parsed again
+            write_binary(binary_path, facets[:10])
+            os.utime(binary_path, ns=(0, 0))
+            self.assertEqual(len(cache.get(binary_path)), 10)
+            self.assertEqual(len(cache), 2)
+            # least recently used entries are evicted first
+            cache.max_bytes = facets.nbytes
+            self.assertEqual(len(cache), 1)
+            self.assertEqual(cache.nbytes, 10 * binary_facets[0].nbytes)
+            del binary_facets
+            cache.clear()
+        self.assertEqual((len(cache), cache.nbytes, cache.hits), (0, 0, 0))
+
+    def test_volume_profile(self):
+        facets = box([2, 3, 4], [1, 1, 5])
+        # the profile must not depend on the orientation of the facets
+        for facets in [facets, facets[:, ::-1]]:
+            profile = VolumeProfile(facets)
+            self.assertAlmostEqual(profile.total_volume, 24)
+            np.testing.assert_allclose(
+                profile.volume_below([4, 5, 6, 7, 9, 10]),
+                [0, 0, 6, 12, 24, 24]
+            )
+            self.assertAlmostEqual(profile.volume_below(8), 18)
+            np.testing.assert_allclose(
+                profile.height_for_volume_fraction([0, 0.25, 0.5, 1]),
+                [5, 6, 7, 9]
+            )
+            self.assertAlmostEqual(
+                profile.height_for_volume_fraction(0.75), 8
+            )
+        with self.assertRaises(ValueError):
+            profile.height_for_volume_fraction(1.5)
+
+    def test_volume_profile_cone(self):
+        # the cone stands on its apex, so that V(z) = V*(z/10)^3
+        facets = read_ascii_stl(self.cone_path)
+        profile = VolumeProfile(facets)
+        self.assertAlmostEqual(
+            profile.total_volume, abs(facet_volume(facets))
+        )
+        levels = np.linspace(0, 10, 11)
+        np.testing.assert_allclose(
+            profile.volume_below(levels),
+            self.cone_volume * (levels / 10)**3,
+            atol=2
+        )
+        fractions = np.linspace(0, 1, 11)
+        np.testing.assert_allclose(
+            profile.volume_below(
+                profile.height_for_volume_fraction(fractions)
+            ),
+            fractions * profile.total_volume,
+            atol=1e-9
+        )
+        np.testing.assert_allclose(
+            profile.height_for_volume_fraction(fractions),
+            10 * fractions**(1/3),
+            atol=0.05
+        )
+
+    def test_iter_stl(self):
+        facets = read_ascii_stl(self.cone_path)
+        with TemporaryDirectory() as temp_dir:
+            binary_path = os.path.join(temp_dir, "cone.stl")
+            write_binary(binary_path, facets)
+            for source_path in [self.cone_path, binary_path]:
+                blocks = list(iter_stl(source_path, block_size=100))
+                self.assertEqual(len(blocks), 17)
+                self.assertTrue(
+                    all(len(block) == 100 for block in blocks[:-1])
+                )
+                np.testing.assert_allclose(
+                    np.concatenate(blocks), facets, rtol=1e-6
+                )
+
+    def test_facet_statistics(self):
+        facets = read_ascii_stl(self.cone_path)
+        cutoff_levels = [np.inf, 7.5, 5]
+        statistics = facet_statistics(
+            iter_stl(self.cone_path, block_size=100), cutoff_levels
+        )
+        self.assertAlmostEqual(statistics.volume, facet_volume(facets))
+        np.testing.assert_allclose(
+            statistics.cutoff_volumes,
+            [facet_volume(facets, level) for level in cutoff_levels]
+        )
+        np.testing.assert_allclose(
+            statistics.min_extent, [-5, -5, 0], atol=1e-4
+        )
+        np.testing.assert_allclose(
+            statistics.max_extent, [5, 5, 10], atol=1e-4
+        )
@@ -0,0 +1,65 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from osp.wrappers.gmsh_wrapper.gmsh_engine import ComplexMesh
+from osp.wrappers.gmsh_wrapper.gmsh_tracing import (
+    span, add_callback, remove_callback, ChromeTraceExporter
+)
+
+path = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestTracing(TestCase):
+
+    def test_disabled(self):
+        spans = list()
+        with span('disabled') as tracer:
+            self.assertIsNone(tracer)
+        add_callback(spans.append)
+        remove_callback(spans.append)
+        with span('disabled'):
+            pass
+        self.assertListEqual(spans, [])
+
+    def test_span(self):
+        spans = list()
+        add_callback(spans.append)
+        try:
+            with span('outer', key='value'):
+                with span('inner'):
+                    sum(range(10000))
+        finally:
+            remove_callback(spans.append)
+        self.assertEqual(['inner', 'outer'], [s.name for s in spans])
+        inner, outer = spans
+        self.assertLessEqual(inner.wall_time, outer.wall_time)
+        self.assertGreaterEqual(inner.start, outer.start)
+        self.assertGreaterEqual(outer.cpu_time, 0)
+        self.assertGreaterEqual(outer.peak_rss_delta, 0)
+        self.assertDictEqual({'key': 'value'}, outer.args)
+
+    def test_chrome_trace(self):
+        exporter = ChromeTraceExporter()
+        add_callback(exporter)
+        try:
+            mesh = ComplexMesh(
+                source_path=os.path.join(path, 'cone.stl'), units='mm'
+            )
+            mesh.inspect_file()
+            mesh.cutoff_volume(0.5)
+        finally:
+            remove_callback(exporter)
+        with TemporaryDirectory() as temp_dir:
+            trace_file = os.path.join(temp_dir, 'trace.json')
+            exporter.write(trace_file)
+            with open(trace_file) as file:
+                events = json.load(file)['traceEvents']
+        self.assertEqual(
+            ['inspect_file', 'calc_volume'],
+            [event['name'] for event in events]
+        )
+        for event in events:
+            self.assertEqual('X', event['ph'])
+            self.assertIn('cpu_time', event['args'])
@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from osp.core.namespaces import emmo
+
+from osp.wrappers.gmsh_wrapper.gmsh_units import (
+    to_meters, si_unit, conversion_factor
+)
+
+
+def length(value, *units):
+    quantity = emmo.Length()
+    quantity.add(
+        emmo.Real(hasNumericalData=value), rel=emmo.hasQuantityValue
+    )
+    quantity.add(*units, rel=emmo.hasReferenceUnit)
+    return quantity
+
+
+class TestUnits(TestCase):
+
+    def test_to_meters(self):
+        quantities = [
+            length(150, emmo.Metre(hasSymbolData='m'),
+                   emmo.Milli(hasSymbolData='m')),
+            length(0.14, emmo.Metre(hasSymbolData='m'),
+                   emmo.Centi(hasSymbolData='c')),
+            length(2, emmo.Metre(hasSymbolData='m'))
+        ]
+        conversion_factor.cache_clear()
+        self.assertListEqual(to_meters(quantities), [0.15, 0.0014, 2])
+        self.assertEqual(conversion_factor.cache_info().misses, 3)
+        to_meters(quantities)
+        self.assertEqual(conversion_factor.cache_info().misses, 3)
+        self.assertEqual(
+            [si_unit(quantity) for quantity in quantities],
+            ['mm', 'cm', 'm']
+        )
+
+    def test_invalid_units(self):
+        with self.assertRaises(ValueError):
+            to_meters([length(1)])
+        with self.assertRaises(ValueError):
+            to_meters([emmo.Length()])